@@ -12,5 +12,19 @@ CREATE INDEX IF NOT EXISTS idx_enrollments_student ON enrollments(student_id);
 CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id);
 -- 4. Index for attendance reports filtered by date range
 CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(attendance_date);
+-- 5. Foreign-key indexes for the child tables
+-- Without these, every ON DELETE CASCADE from enrollments (and every per-enrollment
+-- lookup) seq-scans the two largest tables
+CREATE INDEX IF NOT EXISTS idx_grades_enrollment ON grades(enrollment_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_enrollment ON attendance(enrollment_id);
+-- 6. Trigram indexes for fuzzy/prefix student search (see src/student_search.py)
+-- A plain btree cannot serve ILIKE '%...%' or typo-tolerant matches; GIN + pg_trgm can.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_students_first_name_trgm ON students USING GIN (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_last_name_trgm ON students USING GIN (last_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_email_trgm ON students USING GIN (email gin_trgm_ops);
+-- 7. Sort order for keyset pagination of search results and course rosters
+-- (last_name, first_name, student_id) > (...) seeks straight to the next page instead of OFFSET scanning
+CREATE INDEX IF NOT EXISTS idx_students_name_keyset ON students(last_name, first_name, student_id);
 -- Note: We do not index 'email' or 'course_code' manually because 
 -- the UNIQUE constraint on those columns already created an index for us.
\ No newline at end of file
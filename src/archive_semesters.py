@@ -0,0 +1,300 @@
+import argparse
+import bisect
+import json
+import os
+import re
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+from gpa_engine import GRADE_CUTOFFS, LETTERS
+from prepared_statements import register_statement, execute_prepared
+
+load_dotenv()
+
+# Database Configuration
+DB_PARAMS = {
+    "host": os.getenv("DB_HOST"),
+    "database": os.getenv("DB_NAME"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASS")
+}
+
+# Resolved against the repo root (absolute values are kept), so the CLI and transcript
+# reports find the same archive whatever directory they are started from
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ARCHIVE_DIR = os.path.join(ROOT_DIR, os.getenv("ARCHIVE_DIR", "archive"))
+
+# Fall + Spring = one academic year stays live
+KEEP_SEMESTERS = 2
+TERM_ORDER = {"winter": 0, "spring": 1, "summer": 2, "fall": 3, "autumn": 3}
+
+# What gets archived per semester. Course details are copied onto each enrollment so
+# archived transcripts do not depend on the live courses table.
+EXPORT_QUERIES = {
+    "enrollments": """
+        SELECT e.enrollment_id, e.student_id, e.course_id, c.course_code, c.course_name,
+               c.credits, e.enrollment_date, e.semester
+        FROM enrollments e
+            JOIN courses c ON e.course_id = c.course_id
+        WHERE e.semester = %s
+    """,
+    "grades": """
+        SELECT g.grade_id, g.enrollment_id, g.assessment_type, g.score, g.weight
+        FROM grades g
+            JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+        WHERE e.semester = %s
+    """,
+    "attendance": """
+        SELECT a.attendance_id, a.enrollment_id, a.attendance_date, a.status
+        FROM attendance a
+            JOIN enrollments e ON a.enrollment_id = e.enrollment_id
+        WHERE e.semester = %s
+    """,
+}
+
+# Fixed Arrow types per archived column. Inferring them per part file breaks as soon as
+# one semester has a column that is entirely NULL (e.g. legacy grades without weights):
+# that part gets Arrow's null type and the directory no longer reads back as one dataset.
+# Scores stay exact decimals (same precision as the grades table) so archived transcripts
+# round exactly like the view. Entries are (column, pyarrow type factory, *factory args).
+ARCHIVE_COLUMNS = {
+    "enrollments": [("enrollment_id", "int64"), ("student_id", "int64"), ("course_id", "int64"),
+                    ("course_code", "string"), ("course_name", "string"), ("credits", "int64"),
+                    ("enrollment_date", "date32"), ("semester", "string")],
+    "grades": [("grade_id", "int64"), ("enrollment_id", "int64"), ("assessment_type", "string"),
+               ("score", "decimal128", 5, 2), ("weight", "decimal128", 3, 2)],
+    "attendance": [("attendance_id", "int64"), ("enrollment_id", "int64"),
+                   ("attendance_date", "date32"), ("status", "string")],
+}
+
+# Child tables first so the cascade never has to find them
+DELETE_QUERIES = [
+    ("grades", "DELETE FROM grades WHERE enrollment_id IN (SELECT enrollment_id FROM enrollments WHERE semester = %s)"),
+    ("attendance", "DELETE FROM attendance WHERE enrollment_id IN (SELECT enrollment_id FROM enrollments WHERE semester = %s)"),
+    ("enrollments", "DELETE FROM enrollments WHERE semester = %s"),
+]
+
+# Transcript lookups run on every report request
+register_statement("transcript_live", "SELECT * FROM student_transcripts_view WHERE email = $1")
+register_statement("transcript_student", """
+    SELECT student_id, first_name, last_name, email FROM students WHERE email = $1
+""")
+
+def get_db_connection():
+    try:
+        return psycopg2.connect(**DB_PARAMS)
+    except Exception as e:
+        print(f"Error connecting to DB: {e}")
+        return None
+
+def _archive_schema(table):
+    import pyarrow as pa
+    return pa.schema([(name, getattr(pa, type_name)(*args)) for name, type_name, *args in ARCHIVE_COLUMNS[table]])
+
+# ==========================================
+# SEMESTER SELECTION
+# ==========================================
+def parse_semester(label):
+    """'Fall 2024' -> (2024, 3). Labels like 'External Transfer' return None and are never archived."""
+    match = re.fullmatch(r"\s*([A-Za-z]+)\s+(\d{4})\s*", label or "")
+    if not match or match.group(1).lower() not in TERM_ORDER:
+        return None
+    return int(match.group(2)), TERM_ORDER[match.group(1).lower()]
+
+def closed_semesters(cursor, keep=KEEP_SEMESTERS):
+    """Every dated semester except the `keep` most recent ones, oldest first."""
+    cursor.execute("SELECT DISTINCT semester FROM enrollments;")
+    dated = sorted((key, label) for (label,) in cursor.fetchall()
+                   if (key := parse_semester(label)) is not None)
+    return [label for _, label in dated[:max(len(dated) - keep, 0)]]
+
+def _semester_dir(archive_dir, semester):
+    return os.path.join(archive_dir, re.sub(r"\W+", "_", semester.strip().lower()))
+
+# ==========================================
+# ARCHIVE: EXPORT -> VERIFY -> DELETE
+# ==========================================
+def archive_semester(conn, semester, archive_dir=ARCHIVE_DIR, dry_run=False):
+    """
+    Moves one semester's enrollments, grades and attendance into zstd-compressed
+    Parquet, then deletes them from the live tables. Nothing is deleted unless the
+    exported, re-read and deleted row counts all agree.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    print(f"\n--- Archiving '{semester}' ---")
+    conn.autocommit = False
+    cursor = conn.cursor()
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    semester_dir = _semester_dir(archive_dir, semester)
+    written = []
+
+    try:
+        # Lock the semester's enrollments: new grades/attendance for them would block
+        # (FK check) instead of slipping in between export and delete
+        cursor.execute("SELECT enrollment_id FROM enrollments WHERE semester = %s FOR UPDATE", (semester,))
+        if not cursor.fetchall():
+            print("Skipping: no live enrollments.")
+            conn.rollback()
+            return None
+
+        counts = {}
+        for table, query in EXPORT_QUERIES.items():
+            cursor.execute(query, (semester,))
+            columns = [desc[0] for desc in cursor.description]
+            df = pd.DataFrame(cursor.fetchall(), columns=columns)
+            counts[table] = len(df)
+
+            if dry_run or df.empty:
+                continue
+            # One part file per run, so re-archiving late enrollments never overwrites
+            path = os.path.join(semester_dir, table, f"part-{run_id}.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            arrow_table = pa.Table.from_pandas(df, schema=_archive_schema(table), preserve_index=False)
+            pq.write_table(arrow_table, path, compression='zstd')
+            written.append(path)
+
+            # VALIDATION: Re-read the file footer before trusting it
+            archived = pq.read_metadata(path).num_rows
+            if archived != counts[table]:
+                raise RuntimeError(f"{table}: exported {counts[table]} rows but Parquet holds {archived}")
+
+        print("  -> Rows: " + ", ".join(f"{t}={n:,}" for t, n in counts.items()))
+        if dry_run:
+            conn.rollback()
+            print("  -> Dry run: nothing written or deleted.")
+            return counts
+
+        for table, query in DELETE_QUERIES:
+            cursor.execute(query, (semester,))
+            if cursor.rowcount != counts[table]:
+                raise RuntimeError(f"{table}: archived {counts[table]} rows but deleting {cursor.rowcount}")
+
+        conn.commit()
+        with open(os.path.join(semester_dir, "manifest.jsonl"), "a") as f:
+            f.write(json.dumps({"semester": semester, "run_id": run_id, "rows": counts}) + "\n")
+        print(f"  -> Archived to {semester_dir} and removed from live tables.")
+        return counts
+
+    except Exception:
+        conn.rollback()
+        for path in written:
+            os.remove(path)
+        raise
+    finally:
+        cursor.close()
+
+def vacuum_live_tables(conn):
+    """Makes the freed space reusable and refreshes planner stats after a purge."""
+    conn.autocommit = True
+    cursor = conn.cursor()
+    for table in ("grades", "attendance", "enrollments"):
+        cursor.execute(f"VACUUM ANALYZE {table};")
+    cursor.close()
+
+# ==========================================
+# READ PATH: LIVE + ARCHIVED TRANSCRIPTS
+# ==========================================
+def _read_archive(archive_dir, table, filters):
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame()
+    frames = []
+    for name in sorted(os.listdir(archive_dir)):
+        path = os.path.join(archive_dir, name, table)
+        if os.path.isdir(path):
+            frames.append(pd.read_parquet(path, engine='pyarrow', filters=filters,
+                                          schema=_archive_schema(table)))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def _view_score(scores):
+    """
+    (final_score, letter_grade) for one enrollment, computed like student_transcripts_view:
+    ROUND(AVG(score), 2) with halves rounded up, and the letter from the unrounded average.
+    """
+    if not scores:
+        return None, 'N/A'
+    avg = sum(scores) / len(scores)
+    letter = str(LETTERS[bisect.bisect_right(GRADE_CUTOFFS.tolist(), avg)])
+    return avg.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP), letter
+
+def archived_transcript(student, archive_dir=ARCHIVE_DIR):
+    """
+    Rebuilds student_transcripts_view rows for archived semesters.
+    `student` is (student_id, first_name, last_name, email).
+    """
+    enrollments = _read_archive(archive_dir, "enrollments", [("student_id", "=", student[0])])
+    if enrollments.empty:
+        return []
+
+    ids = enrollments["enrollment_id"].tolist()
+    grades = _read_archive(archive_dir, "grades", [("enrollment_id", "in", ids)])
+    scores = {}
+    for row in grades.itertuples():
+        if not pd.isna(row.score):
+            scores.setdefault(row.enrollment_id, []).append(row.score)
+
+    return [
+        (*student, row.course_code, row.course_name,
+         None if pd.isna(row.credits) else int(row.credits), row.semester,
+         *_view_score(scores.get(row.enrollment_id)))
+        for row in enrollments.itertuples()
+    ]
+
+def fetch_transcript(cursor, email, archive_dir=ARCHIVE_DIR):
+    """
+    Transcript rows in student_transcripts_view layout, archived semesters first.
+    Falls back to the view alone when nothing has been archived.
+    """
+    execute_prepared(cursor, "transcript_live", (email,))
+    live = cursor.fetchall()
+    if not os.path.isdir(archive_dir):
+        return live
+
+    execute_prepared(cursor, "transcript_student", (email,))
+    student = cursor.fetchone()
+    if not student:
+        return live
+    return archived_transcript(student, archive_dir) + live
+
+# ==========================================
+# MAIN
+# ==========================================
+def main():
+    parser = argparse.ArgumentParser(description="Archive closed semesters to compressed Parquet.")
+    parser.add_argument("--semester", action="append", help="Archive this semester (repeatable)")
+    parser.add_argument("--keep", type=int, default=KEEP_SEMESTERS,
+                        help="Most recent semesters to keep live when --semester is not given")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="Only report row counts")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        return
+
+    try:
+        semesters = args.semester or closed_semesters(conn.cursor(), keep=args.keep)
+        conn.rollback()  # End the lookup transaction before archive_semester takes over
+        if not semesters:
+            print("Nothing to archive: no closed semesters.")
+            return
+        print(f"Semesters to archive: {', '.join(semesters)}")
+
+        archived = 0
+        for semester in semesters:
+            if archive_semester(conn, semester, args.archive_dir, dry_run=args.dry_run):
+                archived += 1
+
+        if archived and not args.dry_run:
+            vacuum_live_tables(conn)
+        print(f"\nSUCCESS: {archived} semester(s) processed.")
+    except Exception as e:
+        print(f"\nCRITICAL ERROR: Archive failed and was rolled back. {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import os
+import time
+import psycopg2
+from psycopg2 import errors
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Database Configuration
+DB_PARAMS = {
+    "host": os.getenv("DB_HOST"),
+    "database": os.getenv("DB_NAME"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASS")
+}
+
+BATCH_SIZE = 500
+PAUSE_SECONDS = 0.1
+LOCK_TIMEOUT = "5s"
+MAX_RETRIES = 3
+# Linear backoff between lock-timeout retries (1x, 2x, ...), independent of --pause
+RETRY_BACKOFF_SECONDS = 1.0
+
+# Explicit child-first order: each DELETE is an index lookup on enrollment_id /
+# student_id (sql/create_indexes.sql), so the ON DELETE CASCADE never has to search
+PURGE_QUERIES = [
+    ("grades", """
+        DELETE FROM grades g USING enrollments e
+        WHERE g.enrollment_id = e.enrollment_id AND e.student_id = ANY(%s)
+    """),
+    ("attendance", """
+        DELETE FROM attendance a USING enrollments e
+        WHERE a.enrollment_id = e.enrollment_id AND e.student_id = ANY(%s)
+    """),
+    ("enrollments", "DELETE FROM enrollments WHERE student_id = ANY(%s)"),
+    ("students", "DELETE FROM students WHERE student_id = ANY(%s)"),
+]
+
+def get_db_connection():
+    try:
+        return psycopg2.connect(**DB_PARAMS)
+    except Exception as e:
+        print(f"Error connecting to DB: {e}")
+        return None
+
+# ==========================================
+# 1. TARGET SELECTION
+# ==========================================
+def resolve_targets(cursor, emails=None, major=None):
+    """Student IDs matching the given emails and/or major, in ID order."""
+    conditions, params = [], []
+    if emails:
+        conditions.append("email = ANY(%s)")
+        params.append(list(emails))
+    if major:
+        conditions.append("major = %s")
+        params.append(major)
+    if not conditions:
+        raise ValueError("Refusing to purge without a filter (emails or major).")
+
+    cursor.execute(f"SELECT student_id FROM students WHERE {' AND '.join(conditions)} ORDER BY student_id;", params)
+    return [row[0] for row in cursor.fetchall()]
+
+def read_emails(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+# ==========================================
+# 2. BATCHED DELETE
+# ==========================================
+def _purge_batch(cursor, batch, lock_timeout):
+    """
+    Deletes one batch child-first. Returns (rows per table, seconds per step), where
+    the steps are 'row locks' and then one entry per table in PURGE_QUERIES.
+    """
+    # Applies to every statement below: any single lock wait longer than this aborts the batch
+    cursor.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+    timings = {}
+
+    # Take the row locks up front, in ID order (no deadlocks between concurrent purges).
+    # This step is the lookup plus any wait for sessions holding those rows.
+    start = time.perf_counter()
+    cursor.execute("SELECT student_id FROM students WHERE student_id = ANY(%s) ORDER BY student_id FOR UPDATE", (batch,))
+    cursor.execute("""
+        SELECT enrollment_id FROM enrollments WHERE student_id = ANY(%s) ORDER BY enrollment_id FOR UPDATE
+    """, (batch,))
+    timings["row locks"] = time.perf_counter() - start
+
+    rows = {}
+    for table, query in PURGE_QUERIES:
+        start = time.perf_counter()
+        cursor.execute(query, (batch,))
+        timings[table] = time.perf_counter() - start
+        rows[table] = cursor.rowcount
+    return rows, timings
+
+def purge_students(conn, student_ids, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS,
+                   lock_timeout=LOCK_TIMEOUT, max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF_SECONDS):
+    """
+    Deletes students and all their records in bounded batches, committing after
+    each batch and sleeping `pause` seconds between them so other sessions get in.
+    Batches that hit lock_timeout are rolled back and retried up to `max_retries` times,
+    sleeping `backoff` seconds times the attempt number before each retry.
+    """
+    if max_retries < 1:
+        raise ValueError(f"max_retries must be at least 1 (got {max_retries}).")
+
+    conn.autocommit = False
+    cursor = conn.cursor()
+    batches = [student_ids[i:i + batch_size] for i in range(0, len(student_ids), batch_size)]
+    totals = {table: 0 for table, _ in PURGE_QUERIES}
+    step_totals = {}
+    started = time.perf_counter()
+
+    print(f"--- Purging {len(student_ids):,} students in {len(batches)} batch(es) of up to {batch_size} ---")
+    try:
+        for number, batch in enumerate(batches, start=1):
+            for attempt in range(1, max_retries + 1):
+                try:
+                    rows, timings = _purge_batch(cursor, batch, lock_timeout)
+                    conn.commit()
+                    break
+                except errors.LockNotAvailable:
+                    conn.rollback()
+                    if attempt == max_retries:
+                        raise
+                    print(f"  -> Batch {number}: lock timeout, retrying ({attempt}/{max_retries})...")
+                    time.sleep(backoff * attempt)
+
+            for table, count in rows.items():
+                totals[table] += count
+            for step, seconds in timings.items():
+                step_totals[step] = step_totals.get(step, 0.0) + seconds
+
+            elapsed = time.perf_counter() - started
+            deleted = sum(totals.values())
+            print(f"  -> Batch {number}/{len(batches)}: {totals['students']:,} students, "
+                  f"{deleted:,} rows total | {deleted / elapsed:,.0f} rows/sec | "
+                  f"row locks {timings['row locks'] * 1000:.1f} ms, "
+                  f"deletes {(sum(timings.values()) - timings['row locks']) * 1000:.1f} ms")
+
+            if number < len(batches):
+                time.sleep(pause)
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - started
+    print("\nPurge complete: " + ", ".join(f"{t}={n:,}" for t, n in totals.items()))
+    print(f"  -> {sum(totals.values()):,} rows in {elapsed:.1f}s "
+          f"({sum(totals.values()) / elapsed if elapsed else 0:,.0f} rows/sec)")
+    print("  -> Time per step: " + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in step_totals.items()))
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-delete students and all their records in batches.")
+    parser.add_argument("--email", action="append", default=[], help="Student email (repeatable)")
+    parser.add_argument("--emails-file", help="File with one student email per line")
+    parser.add_argument("--major", help="Purge every student in this major")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=PAUSE_SECONDS, help="Seconds to sleep between batches")
+    parser.add_argument("--lock-timeout", default=LOCK_TIMEOUT)
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES,
+                        help="Attempts per batch when it hits the lock timeout")
+    parser.add_argument("--retry-backoff", type=float, default=RETRY_BACKOFF_SECONDS,
+                        help="Seconds before the first retry of a batch (then 2x, 3x, ...)")
+    parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
+    args = parser.parse_args()
+
+    emails = args.email + (read_emails(args.emails_file) if args.emails_file else [])
+
+    conn = get_db_connection()
+    if conn is None:
+        return
+
+    try:
+        cursor = conn.cursor()
+        student_ids = resolve_targets(cursor, emails=emails, major=args.major)
+        cursor.close()
+        conn.rollback()  # End the lookup transaction before purge_students takes over
+
+        if not student_ids:
+            print("No matching students found.")
+            return
+        if emails and len(student_ids) < len(set(emails)):
+            print(f"Warning: {len(set(emails)) - len(student_ids)} email(s) did not match a student.")
+
+        if not args.yes:
+            confirm = input(f"Are you sure you want to delete {len(student_ids):,} students and ALL their records? (yes/no): ")
+            if confirm.lower() != 'yes':
+                print("Purge cancelled.")
+                return
+
+        purge_students(conn, student_ids, batch_size=args.batch_size, pause=args.pause,
+                       lock_timeout=args.lock_timeout, max_retries=args.max_retries,
+                       backoff=args.retry_backoff)
+    except Exception as e:
+        conn.rollback()
+        print(f"\nCRITICAL ERROR: Purge stopped; completed batches stay committed. {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,33 @@
-import psycopg2
 import csv
-import os
 import re
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from dotenv import load_dotenv
+from student_search import search_students, course_roster
+from archive_semesters import fetch_transcript
+from db_router import get_router
 
 load_dotenv()
 
-# Database Configuration
-DB_PARAMS = {
-    "host": os.getenv("DB_HOST"),
-    "database": os.getenv("DB_NAME"),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASS")
-}
+# Menu options that write; reads are pinned to the primary for a while after these
+WRITE_CHOICES = {'1', '2', '3', '4', '6'}
 
 def get_db_connection():
     try:
-        conn = psycopg2.connect(**DB_PARAMS)
-        conn.autocommit = True 
-        return conn
+        # Primary (DB_HOST); replicas from DB_REPLICA_HOSTS serve reporting reads
+        return get_router().primary()
     except Exception as e:
         print(f"Error connecting to DB: {e}")
         return None
 
+def run_read_only(router, action):
+    """Runs a reporting action on a replica cursor (or the primary right after a write)."""
+    try:
+        with router.reader().cursor() as cursor:
+            action(cursor)
+    except Exception as e:
+        print(f"ERROR: {e}")
+
 # ==========================================
 # VALIDATION HELPERS
 # ==========================================
@@ -159,8 +162,8 @@ def generate_reports(cursor):
     email = input("Student Email: ")
     
     try:
-        cursor.execute("SELECT * FROM student_transcripts_view WHERE email = %s", (email,))
-        records = cursor.fetchall()
+        # Live semesters from the view, archived semesters from Parquet
+        records = fetch_transcript(cursor, email)
         
         if not records:
             print("No records found.")
@@ -197,10 +200,44 @@ def generate_reports(cursor):
     except Exception as e:
         print(f"ERROR: {e}")
 
+def search_students_ui(cursor):
+    print("\n--- SEARCH STUDENTS ---")
+    print("1. Name/Email (starts with)")
+    print("2. Name/Email (fuzzy, tolerates typos)")
+    print("3. Course Roster")
+    sub_choice = input("Choose search (1-3): ")
+
+    try:
+        if sub_choice in ('1', '2'):
+            term = input("Search for: ")
+            mode = 'prefix' if sub_choice == '1' else 'fuzzy'
+            fetch_page = lambda after: search_students(cursor, term, mode=mode, after=after)
+        elif sub_choice == '3':
+            code = input("Course Code (e.g., DE101): ")
+            semester = input("Semester (blank for all): ") or None
+            fetch_page = lambda after: course_roster(cursor, code, semester=semester, after=after)
+        else:
+            print("Invalid selection.")
+            return
+
+        next_key = None
+        while True:
+            rows, next_key = fetch_page(next_key)
+            if not rows:
+                print("No students found.")
+                return
+            for row in rows:
+                print(f"{row[1]} {row[2]:<25} | {row[3]}")
+            if next_key is None or input("More results? (n = next page): ").lower() != 'n':
+                return
+    except Exception as e:
+        print(f"ERROR: {e}")
+
 # ==========================================
 # MAIN MENU
 # ==========================================
 def main_menu():
+    router = get_router()
     conn = get_db_connection()
     if not conn: return
     cursor = conn.cursor()
@@ -213,23 +250,28 @@ def main_menu():
         print("4. Mark Attendance (New)")
         print("5. Generate Reports (CSV/PDF)")
         print("6. Delete Student (New)")
-        print("7. Exit")
+        print("7. Search Students")
+        print("8. Exit")
         
-        choice = input("Select an option (1-7): ")
+        choice = input("Select an option (1-8): ")
         
         if choice == '1': add_new_student(cursor)
         elif choice == '2': enroll_student_ui(cursor)
         elif choice == '3': record_grade_ui(cursor)
         elif choice == '4': mark_attendance_ui(cursor)
-        elif choice == '5': generate_reports(cursor)
+        elif choice == '5': run_read_only(router, generate_reports)
         elif choice == '6': delete_student(cursor)
-        elif choice == '7': 
+        elif choice == '7': run_read_only(router, search_students_ui)
+        elif choice == '8': 
             print("Exiting System.")
             break
         else:
             print("Invalid selection.")
 
-    conn.close()
+        if choice in WRITE_CHOICES:
+            router.record_write()
+
+    router.close()
 
 if __name__ == "__main__":
     main_menu()
\ No newline at end of file
@@ -1,83 +1,256 @@
-import pandas as pd
+import argparse
+import csv
+import io
 import json
-import random
 import os
+import random
+import time
+from collections import deque
+from datetime import date, timedelta
+from functools import partial
+from multiprocessing import Pool
 from faker import Faker
 
-# Use GB locale to match your DB
-fake = Faker('en_GB') 
+OUTPUT_DIR = 'raw_data'
+
+# Intentional dirty data, as fractions of generated rows.
+# Orphan student IDs are negative: student_id is SERIAL, so no database (generate_data.py
+# seeds 100-500 students, the test template 150) can ever hold them, however large
+# --grade-students is.
+DEFAULT_DIRTY_RATIOS = {
+    "null_email": 0.10,      # CSV: student with no email (dropped by the ETL)
+    "bad_score": 0.02,       # JSON: score outside 0-100 (violates the grades CHECK)
+    "orphan_student": 0.05,  # JSON: negative student_ref_id, never a real student
+    "orphan_course": 0.02,   # JSON: course_code_ref that does not exist
+}
+
+BASE_COURSES = [
+    ("Blockchain Fundamentals", "BC101", 3),
+    ("Quantum Computing Intro", "QC101", 4),
+    ("Ethical AI", "AI305", 2),
+    ("Robotics Process Automation", "RPA101", 3),
+]
+
+# Codes the grades may reference: seeded by generate_data.py or shipped in the Excel file
+DEFAULT_GRADE_COURSES = ["DE101", "CS201", "DB301", "AI201", "BC101", "QC101", "AI305", "RPA101"]
+ORPHAN_COURSE_CODE = "XX999"
+ASSESSMENTS = [("Final Project", 0.40), ("Midterm", 0.30), ("Final", 0.50)]
+
+# Fixed reference date so dates of birth are reproducible for a given seed
+REFERENCE_DATE = date(2025, 1, 1)
+
+# Populated once per process by _init_name_pools()
+_FIRST_NAMES = []
+_LAST_NAMES = []
+
+# ==========================================
+# SEEDING & PARALLEL CHUNKING
+# ==========================================
+def _init_name_pools(seed, pool_size=1000):
+    """Builds the same Faker name pools in every worker so output does not depend on scheduling."""
+    fake = Faker('en_GB')
+    fake.seed_instance(seed)
+    _FIRST_NAMES[:] = [fake.first_name() for _ in range(pool_size)]
+    _LAST_NAMES[:] = [fake.last_name() for _ in range(pool_size)]
+
+def _chunk_rng(seed, chunk_index):
+    # Each chunk owns its RNG, so chunk N is identical however many workers run
+    return random.Random(seed * 1_000_003 + chunk_index)
+
+def _generate_chunks(chunk_fn, total, chunk_size, seed, workers):
+    """
+    Yields chunk_fn's (text, row count) per chunk, in order; chunks are generated across
+    `workers` processes.
+    """
+    chunks = [(i, i * chunk_size, min(chunk_size, total - i * chunk_size))
+              for i in range((total + chunk_size - 1) // chunk_size)]
+
+    if workers <= 1:
+        _init_name_pools(seed)
+        for chunk in chunks:
+            yield chunk_fn(chunk)
+        return
+
+    # At most 2 chunks per worker in flight: when the writer falls behind, workers wait
+    # instead of finished chunks piling up in this process (Pool.imap has no such limit)
+    window = 2 * workers
+    with Pool(workers, initializer=_init_name_pools, initargs=(seed,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(chunk_fn, (chunk,)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+def _progress(label, written, total, started):
+    elapsed = time.perf_counter() - started
+    rate = written / elapsed if elapsed else 0
+    print(f"  -> {label}: {written:,}/{total:,} rows ({rate:,.0f} rows/sec)", end='\r')
+
+# ==========================================
+# 1. STUDENTS (CSV)
+# ==========================================
+def _student_chunk(chunk, seed, ratios):
+    """One chunk of CSV lines, formatted in the worker so the parent only writes."""
+    chunk_index, start, count = chunk
+    rng = _chunk_rng(seed, chunk_index)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for offset in range(count):
+        first = rng.choice(_FIRST_NAMES)
+        last = rng.choice(_LAST_NAMES)
+        if rng.random() < ratios["null_email"]:
+            email = None
+        else:
+            # Row number keeps emails unique however large the file gets
+            clean_last = last.lower().replace(' ', '')
+            email = f"{first.lower()}.{clean_last}.{start + offset}@externalsource.com"
+        dob = REFERENCE_DATE - timedelta(days=rng.randint(18 * 365, 40 * 365))
+        writer.writerow((first, last, email, dob.isoformat(), "External Transfer"))
+    return buffer.getvalue(), count
+
+def generate_csv_students(count=50, seed=42, chunk_size=100_000, workers=1, ratios=None):
+    """Streams a CSV of student info (some with missing emails) chunk by chunk."""
+    ratios = {**DEFAULT_DIRTY_RATIOS, **(ratios or {})}
+    path = os.path.join(OUTPUT_DIR, 'csv_source', 'new_students.csv')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    print(f"--- Creating 'new_students.csv' with {count:,} records ---")
+
+    started = time.perf_counter()
+    written = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["first_name", "last_name", "email", "dob", "major"])
+        chunk_fn = partial(_student_chunk, seed=seed, ratios=ratios)
+        for text, rows in _generate_chunks(chunk_fn, count, chunk_size, seed, workers):
+            f.write(text)
+            written += rows
+            _progress('new_students.csv', written, count, started)
+    print(f"\n -> Saved {path}")
+
+# ==========================================
+# 2. COURSES (Excel)
+# ==========================================
+def generate_excel_courses(count=len(BASE_COURSES)):
+    """Streams the course catalogue through openpyxl's write-only mode."""
+    from openpyxl import Workbook
 
-# Ensure directories exist
-os.makedirs('raw_data/csv_source', exist_ok=True)
-os.makedirs('raw_data/excel_source', exist_ok=True)
-os.makedirs('raw_data/json_source', exist_ok=True)
+    path = os.path.join(OUTPUT_DIR, 'excel_source', 'future_courses.xlsx')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    print(f"--- Creating 'future_courses.xlsx' with {count:,} courses ---")
 
-def generate_csv_students(count=50):
-    """Generates a CSV with student info (some with bad emails)."""
-    data = []
-    print(f"--- Creating 'new_students.csv' with {count} records ---")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Course Name", "Code", "Credits"])
+    for i in range(count):
+        if i < len(BASE_COURSES):
+            ws.append(list(BASE_COURSES[i]))
+        else:
+            # Deterministic filler courses for load tests (course_code is VARCHAR(20))
+            ws.append([f"Special Topics {i:06d}", f"ST{i:06d}", 2 + i % 3])
+    wb.save(path)
+    print(f" -> Saved {path}")
+
+# ==========================================
+# 3. GRADES (JSON / JSONL)
+# ==========================================
+def _grade_chunk(chunk, seed, ratios, num_students, course_codes, fmt):
+    """
+    One chunk of grade objects, formatted in the worker: one per line for 'jsonl',
+    otherwise comma-separated array elements (the caller adds the separator between chunks).
+    """
+    chunk_index, _, count = chunk
+    rng = _chunk_rng(seed, chunk_index)
+    rows = []
     for _ in range(count):
-        first = fake.first_name()
-        last = fake.last_name()
-        # Intentional dirty data: 10% chance of missing email
-        if random.random() < 0.1:
-            email = None 
+        if rng.random() < ratios["orphan_student"]:
+            student_id = -rng.randint(1, num_students)
+        else:
+            student_id = rng.randint(1, num_students)
+
+        if rng.random() < ratios["orphan_course"]:
+            course_code = ORPHAN_COURSE_CODE
+        else:
+            course_code = rng.choice(course_codes)
+
+        if rng.random() < ratios["bad_score"]:
+            score = round(rng.choice([rng.uniform(-50, -0.01), rng.uniform(100.01, 150)]), 2)
         else:
-            email = f"{first}.{last}@externalsource.com".lower()
-            
-        data.append({
-            "first_name": first,
-            "last_name": last,
-            "email": email,
-            "dob": fake.date_of_birth(minimum_age=18, maximum_age=40),
-            "major": "External Transfer"
-        })
-    
-    df = pd.DataFrame(data)
-    df.to_csv('raw_data/csv_source/new_students.csv', index=False)
-    print(" -> Saved raw_data/csv_source/new_students.csv")
-
-def generate_excel_courses():
-    """Generates an Excel file with new courses."""
-    print("--- Creating 'future_courses.xlsx' ---")
-    courses = [
-        {"Course Name": "Blockchain Fundamentals", "Code": "BC101", "Credits": 3},
-        {"Course Name": "Quantum Computing Intro", "Code": "QC101", "Credits": 4},
-        {"Course Name": "Ethical AI", "Code": "AI305", "Credits": 2},
-        {"Course Name": "Robotics Process Automation", "Code": "RPA101", "Credits": 3}
-    ]
-    
-    df = pd.DataFrame(courses)
-    # Requires 'openpyxl' library
-    df.to_excel('raw_data/excel_source/future_courses.xlsx', index=False)
-    print(" -> Saved raw_data/excel_source/future_courses.xlsx")
-
-def generate_json_grades():
-    """Generates a JSON file with unnormalized grade data."""
-    print("--- Creating 'legacy_grades.json' ---")
-    grades = []
-    # Generate random grades for existing students (IDs 1-50)
-    for student_id in range(1, 51):
-        grades.append({
+            score = round(rng.uniform(60, 100), 2)
+
+        assessment, weight = rng.choice(ASSESSMENTS)
+        rows.append(json.dumps({
             "student_ref_id": student_id,
-            "course_code_ref": "DE101", # Assuming this course exists
-            "assessment": "Final Project",
-            "score": round(random.uniform(60, 100), 2),
-            "weight": 0.40
-        })
-        
-    with open('raw_data/json_source/legacy_grades.json', 'w') as f:
-        json.dump(grades, f, indent=4)
-    print(" -> Saved raw_data/json_source/legacy_grades.json")
+            "course_code_ref": course_code,
+            "assessment": assessment,
+            "score": score,
+            "weight": weight
+        }))
+    if fmt == 'jsonl':
+        return "".join(row + "\n" for row in rows), count
+    return "    " + ",\n    ".join(rows), count
+
+def generate_json_grades(count=50, num_students=50, course_codes=None, fmt='json',
+                         seed=42, chunk_size=100_000, workers=1, ratios=None):
+    """
+    Streams unnormalized grade data. 'json' writes one array incrementally (what the
+    ETL reads); 'jsonl' writes one object per line.
+    """
+    ratios = {**DEFAULT_DIRTY_RATIOS, **(ratios or {})}
+    course_codes = course_codes or DEFAULT_GRADE_COURSES
+    filename = 'legacy_grades.jsonl' if fmt == 'jsonl' else 'legacy_grades.json'
+    path = os.path.join(OUTPUT_DIR, 'json_source', filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    print(f"--- Creating '{filename}' with {count:,} records ---")
+
+    started = time.perf_counter()
+    written = 0
+    with open(path, 'w') as f:
+        if fmt != 'jsonl':
+            f.write("[\n")
+        chunk_fn = partial(_grade_chunk, seed=seed, ratios=ratios, num_students=num_students,
+                           course_codes=course_codes, fmt=fmt)
+        for text, rows in _generate_chunks(chunk_fn, count, chunk_size, seed, workers):
+            # Array elements: a comma goes between chunks, never before the first
+            if fmt != 'jsonl' and written:
+                f.write(",\n")
+            f.write(text)
+            written += rows
+            _progress(filename, written, count, started)
+        if fmt != 'jsonl':
+            f.write("\n]\n")
+    print(f"\n -> Saved {path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate seeded raw source files for the ETL.")
+    parser.add_argument("--students", type=int, default=50, help="Rows in new_students.csv")
+    parser.add_argument("--courses", type=int, default=len(BASE_COURSES), help="Rows in future_courses.xlsx")
+    parser.add_argument("--grades", type=int, default=50, help="Rows in legacy_grades.json")
+    parser.add_argument("--grade-students", type=int, default=50,
+                        help="Grades reference student IDs 1..N (IDs the database already holds)")
+    parser.add_argument("--course-codes", nargs="+", default=DEFAULT_GRADE_COURSES,
+                        help="Course codes the grades may reference")
+    parser.add_argument("--json-format", choices=["json", "jsonl"], default="json")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to generate chunks")
+    for name, default in DEFAULT_DIRTY_RATIOS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}-ratio", type=float, default=default, dest=name)
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    # You might need to install pandas and openpyxl first
-    # pip install pandas openpyxl
+    args = parse_args()
+    ratios = {name: getattr(args, name) for name in DEFAULT_DIRTY_RATIOS}
     try:
-        generate_csv_students()
-        generate_excel_courses()
-        generate_json_grades()
+        generate_csv_students(args.students, seed=args.seed, chunk_size=args.chunk_size,
+                              workers=args.workers, ratios=ratios)
+        generate_excel_courses(args.courses)
+        generate_json_grades(args.grades, num_students=args.grade_students,
+                             course_codes=args.course_codes, fmt=args.json_format,
+                             seed=args.seed, chunk_size=args.chunk_size,
+                             workers=args.workers, ratios=ratios)
         print("\nSUCCESS: Raw source files created.")
     except ImportError as e:
         print(f"\nERROR: Missing library. {e}")
-        print("Run: pip install pandas openpyxl")
\ No newline at end of file
+        print("Run: pip install faker openpyxl")
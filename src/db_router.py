@@ -0,0 +1,240 @@
+import argparse
+import itertools
+import os
+import random
+import threading
+import time
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Database Configuration: writes always go to DB_HOST (the primary)
+PRIMARY_PARAMS = {
+    "host": os.getenv("DB_HOST"),
+    "database": os.getenv("DB_NAME"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASS")
+}
+
+# Read replicas: comma-separated host or host:port, same database and credentials
+REPLICA_HOSTS = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+
+# Reads stay on the primary this long after a write (read-your-writes)
+PIN_SECONDS = float(os.getenv("DB_READ_PIN_SECONDS", "5"))
+# Replicas further behind than this are skipped
+MAX_LAG_SECONDS = float(os.getenv("DB_MAX_REPLICA_LAG", "5"))
+LAG_CHECK_INTERVAL = 2.0
+
+# 0 when streaming and fully caught up (or idle); otherwise seconds since the last
+# replayed transaction. NULL (never used) when the WAL receiver is not streaming: the
+# receive LSN then stops moving, so "received = replayed" says nothing about the primary.
+# Roles without pg_read_all_stats see the receiver's row but a NULL status, so a running
+# receiver counts as streaming for them.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver
+                         WHERE COALESCE(status, 'streaming') = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END;
+"""
+
+def replica_params(hosts=REPLICA_HOSTS):
+    params = []
+    for entry in hosts:
+        host, _, port = entry.partition(":")
+        params.append({**PRIMARY_PARAMS, "host": host, **({"port": port} if port else {})})
+    return params
+
+class ConnectionRouter:
+    """
+    Hands out the primary for writes and a replica for read-only work.
+    Reads fall back to the primary while pinned after a write, when a replica
+    lags more than max_lag_seconds, or when no replica is reachable.
+    """
+
+    def __init__(self, primary_params=PRIMARY_PARAMS, replicas=None, pin_seconds=PIN_SECONDS,
+                 max_lag_seconds=MAX_LAG_SECONDS, lag_check_interval=LAG_CHECK_INTERVAL,
+                 connect=psycopg2.connect, clock=time.monotonic):
+        self.primary_params = primary_params
+        self.replicas = replica_params() if replicas is None else replicas
+        self.pin_seconds = pin_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.connect = connect
+        self.clock = clock
+
+        self._primary = None
+        self._replica_conns = [None] * len(self.replicas)
+        self._lag = [(float("-inf"), None)] * len(self.replicas)  # (checked_at, seconds)
+        self._next = itertools.cycle(range(len(self.replicas)))
+        self._pinned_until = float("-inf")
+
+    def _open(self, params, readonly):
+        conn = self.connect(**params)
+        conn.set_session(readonly=readonly, autocommit=True)
+        return conn
+
+    def primary(self):
+        if self._primary is None or self._primary.closed:
+            self._primary = self._open(self.primary_params, readonly=False)
+        return self._primary
+
+    def writer(self):
+        """The primary, marked as written to (pins subsequent reads)."""
+        conn = self.primary()
+        self.record_write()
+        return conn
+
+    def record_write(self):
+        self._pinned_until = self.clock() + self.pin_seconds
+
+    def is_pinned(self):
+        return self.clock() < self._pinned_until
+
+    def _replica(self, index):
+        conn = self._replica_conns[index]
+        if conn is None or conn.closed:
+            conn = self._replica_conns[index] = self._open(self.replicas[index], readonly=True)
+        return conn
+
+    def _lag_seconds(self, index, conn):
+        checked_at, lag = self._lag[index]
+        if self.clock() - checked_at >= self.lag_check_interval:
+            cursor = conn.cursor()
+            cursor.execute(LAG_SQL)
+            value = cursor.fetchone()[0]
+            cursor.close()
+            lag = float("inf") if value is None else float(value)
+            self._lag[index] = (self.clock(), lag)
+        return lag
+
+    def reader(self):
+        """A connection for read-only work, load-balanced round-robin across healthy replicas."""
+        if self.replicas and not self.is_pinned():
+            for _ in range(len(self.replicas)):
+                index = next(self._next)
+                try:
+                    conn = self._replica(index)
+                    if self._lag_seconds(index, conn) <= self.max_lag_seconds:
+                        return conn
+                except psycopg2.Error as e:
+                    print(f"Replica {self.replicas[index].get('host')} unavailable: {e}")
+                    self._replica_conns[index] = None
+        return self.primary()
+
+    def close(self):
+        for conn in [self._primary, *self._replica_conns]:
+            if conn is not None and not conn.closed:
+                conn.close()
+
+_router = None
+
+def get_router():
+    """Process-wide router built from the DB_* environment settings."""
+    global _router
+    if _router is None:
+        _router = ConnectionRouter()
+    return _router
+
+# ==========================================
+# BENCHMARK: REPORTING THROUGHPUT
+# ==========================================
+REPORT_QUERIES = [
+    # Dean's List (analytics.sql #3)
+    """
+    SELECT s.student_id, s.first_name, s.last_name, ROUND(AVG(g.score), 2) AS overall_gpa
+    FROM students s
+        JOIN enrollments e ON s.student_id = e.student_id
+        JOIN grades g ON e.enrollment_id = g.enrollment_id
+    GROUP BY s.student_id
+    HAVING COUNT(g.score) > 2
+    ORDER BY overall_gpa DESC
+    LIMIT 10;
+    """,
+    # Course performance (analytics.sql #1)
+    """
+    SELECT c.course_code, ROUND(AVG(g.score), 2)
+    FROM courses c
+        JOIN enrollments e ON c.course_id = e.course_id
+        JOIN grades g ON e.enrollment_id = g.enrollment_id
+    GROUP BY c.course_code;
+    """,
+    # Transcript export
+    "SELECT * FROM student_transcripts_view WHERE email = %s;",
+]
+
+def _report_worker(router, emails, deadline, counter, lock):
+    done = 0
+    rng = random.Random()
+    while time.monotonic() < deadline:
+        query = rng.choice(REPORT_QUERIES)
+        cursor = router.reader().cursor()
+        cursor.execute(query, (rng.choice(emails),) if "%s" in query else None)
+        cursor.fetchall()
+        cursor.close()
+        done += 1
+    with lock:
+        counter[0] += done
+
+def _measure(label, make_router, emails, threads, seconds):
+    counter, lock = [0], threading.Lock()
+    routers = [make_router() for _ in range(threads)]
+    deadline = time.monotonic() + seconds
+    workers = [threading.Thread(target=_report_worker, args=(r, emails, deadline, counter, lock))
+               for r in routers]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    for r in routers:
+        r.close()
+    rate = counter[0] / seconds
+    print(f"{label:<28} | {counter[0]:>8,} queries | {rate:>8,.1f} q/s")
+    return rate
+
+def run_benchmark(threads=8, seconds=10):
+    replicas = replica_params()
+    if not replicas:
+        print("Set DB_REPLICA_HOSTS to benchmark replica routing.")
+        return
+
+    primary = ConnectionRouter(replicas=[]).primary()
+    cursor = primary.cursor()
+    cursor.execute("SELECT email FROM students ORDER BY random() LIMIT 1000;")
+    emails = [row[0] for row in cursor.fetchall()] or ["nobody@example.com"]
+    cursor.close()
+    primary.close()
+
+    print(f"--- Reporting throughput: {threads} threads x {seconds}s, {len(replicas)} replica(s) ---")
+    base = _measure("primary only", lambda: ConnectionRouter(replicas=[]), emails, threads, seconds)
+    routed = _measure("routed to replicas", lambda: ConnectionRouter(replicas=random.sample(replicas, len(replicas))),
+                      emails, threads, seconds)
+    if base:
+        print(f"\nSpeed-up: {routed / base:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Read/write routing diagnostics and benchmark.")
+    parser.add_argument("--benchmark", action="store_true", help="Compare reporting throughput")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(threads=args.threads, seconds=args.seconds)
+        return
+
+    router = get_router()
+    print(f"Primary: {PRIMARY_PARAMS['host']}")
+    for index, params in enumerate(router.replicas):
+        try:
+            lag = router._lag_seconds(index, router._replica(index))
+            print(f"Replica: {params['host']} (lag {lag:.1f}s)")
+        except psycopg2.Error as e:
+            print(f"Replica: {params['host']} UNAVAILABLE ({e})")
+    router.close()
+
+if __name__ == "__main__":
+    main()
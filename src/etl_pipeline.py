@@ -3,6 +3,7 @@ import psycopg2
 import json
 import os
 from dotenv import load_dotenv
+from prepared_statements import register_statement, execute_prepared, print_stats
 
 load_dotenv()
 
@@ -14,6 +15,33 @@ DB_PARAMS = {
     "password": os.getenv("DB_PASS")
 }
 
+# Hot row-at-a-time statements: parsed and planned once per connection
+register_statement("etl_insert_student", """
+    INSERT INTO students (first_name, last_name, email, date_of_birth, major)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (email) DO NOTHING
+""")
+register_statement("etl_insert_course", """
+    INSERT INTO courses (course_name, course_code, credits)
+    VALUES ($1, $2, $3)
+    ON CONFLICT (course_code) DO NOTHING
+""")
+register_statement("etl_student_exists", "SELECT 1 FROM students WHERE student_id = $1")
+register_statement("etl_course_id", "SELECT course_id FROM courses WHERE course_code = $1")
+register_statement("etl_find_enrollment", """
+    SELECT enrollment_id FROM enrollments
+    WHERE student_id = $1 AND course_id = $2
+""")
+register_statement("etl_create_enrollment", """
+    INSERT INTO enrollments (student_id, course_id, semester, enrollment_date)
+    VALUES ($1, $2, 'External Transfer', CURRENT_DATE)
+    RETURNING enrollment_id
+""")
+register_statement("etl_insert_grade", """
+    INSERT INTO grades (enrollment_id, assessment_type, score, weight)
+    VALUES ($1, $2, $3, $4)
+""")
+
 def get_db_connection():
     try:
         return psycopg2.connect(**DB_PARAMS)
@@ -44,11 +72,8 @@ def process_students(cursor):
     count = 0
     for _, row in df_clean.iterrows():
         try:
-            cursor.execute("""
-                INSERT INTO students (first_name, last_name, email, date_of_birth, major)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (email) DO NOTHING;
-            """, (row['first_name'], row['last_name'], row['email'], row['dob'], row['major']))
+            execute_prepared(cursor, "etl_insert_student",
+                             (row['first_name'], row['last_name'], row['email'], row['dob'], row['major']))
             count += 1
         except Exception as e:
             print(f"Error loading student {row['email']}: {e}")
@@ -68,11 +93,7 @@ def process_courses(cursor):
     # Load
     count = 0
     for _, row in df.iterrows():
-        cursor.execute("""
-            INSERT INTO courses (course_name, course_code, credits)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (course_code) DO NOTHING;
-        """, (row['Course Name'], row['Code'], row['Credits']))
+        execute_prepared(cursor, "etl_insert_course", (row['Course Name'], row['Code'], row['Credits']))
         count += 1
     print(f"Loaded: Processed {count} courses.")
 
@@ -98,17 +119,24 @@ def process_grades(cursor):
     for item in grades_data:
         student_id = item['student_ref_id']
         course_code = item['course_code_ref']
+
+        # CHECK 0: Score must satisfy the grades CHECK constraint (0-100),
+        # otherwise one bad row would abort the whole transaction
+        if item['score'] is None or not 0 <= item['score'] <= 100:
+            print(f"Skipping grade: Score {item['score']} out of range for student ID {student_id}.")
+            skipped += 1
+            continue
         
         # CHECK 1: Does the student exist? 
         # (They might have been cleaned out in the CSV step)
-        cursor.execute("SELECT 1 FROM students WHERE student_id = %s", (student_id,))
+        execute_prepared(cursor, "etl_student_exists", (student_id,))
         if not cursor.fetchone():
             print(f"Skipping grade: Student ID {student_id} not found (filtered out).")
             skipped += 1
             continue
 
         # CHECK 2: Find the course_id for 'DE101'
-        cursor.execute("SELECT course_id FROM courses WHERE course_code = %s", (course_code,))
+        execute_prepared(cursor, "etl_course_id", (course_code,))
         course_res = cursor.fetchone()
         
         if not course_res:
@@ -118,32 +146,23 @@ def process_grades(cursor):
         course_id = course_res[0]
 
         # 3. Find or Create Enrollment (Idempotent)
-        cursor.execute("""
-            SELECT enrollment_id FROM enrollments 
-            WHERE student_id = %s AND course_id = %s;
-        """, (student_id, course_id))
+        execute_prepared(cursor, "etl_find_enrollment", (student_id, course_id))
         enrollment_res = cursor.fetchone()
 
         if enrollment_res:
             enrollment_id = enrollment_res[0]
         else:
             # Create a new enrollment if one doesn't exist
-            cursor.execute("""
-                INSERT INTO enrollments (student_id, course_id, semester, enrollment_date)
-                VALUES (%s, %s, 'External Transfer', CURRENT_DATE)
-                RETURNING enrollment_id;
-            """, (student_id, course_id))
+            execute_prepared(cursor, "etl_create_enrollment", (student_id, course_id))
             enrollment_id = cursor.fetchone()[0]
 
         # 4. Load Grade
-        cursor.execute("""
-            INSERT INTO grades (enrollment_id, assessment_type, score, weight)
-            VALUES (%s, %s, %s, %s);
-        """, (enrollment_id, item['assessment'], item['score'], item['weight']))
+        execute_prepared(cursor, "etl_insert_grade",
+                         (enrollment_id, item['assessment'], item['score'], item['weight']))
         count += 1
 
     print(f"Loaded: {count} grade records.")
-    print(f"Skipped: {skipped} orphan records (student/course missing).")
+    print(f"Skipped: {skipped} invalid records (score out of range or student/course missing).")
 
 # ==========================================
 # MAIN PIPELINE CONTROLLER
@@ -163,6 +182,7 @@ def main():
         
         conn.commit()
         print("\nSUCCESS: ETL Pipeline Finished Successfully.")
+        print_stats(conn)
         
     except Exception as e:
         conn.rollback()
@@ -4,6 +4,7 @@ import os
 from faker import Faker
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from prepared_statements import register_statement, execute_prepared, print_stats
 
 load_dotenv()
 
@@ -18,6 +19,35 @@ DB_PARAMS = {
     "password": os.getenv("DB_PASS")
 }
 
+# Hot row-at-a-time statements: parsed and planned once per connection
+register_statement("gen_insert_course", """
+    INSERT INTO courses (course_name, course_code, credits)
+    VALUES ($1, $2, $3)
+    ON CONFLICT (course_code) DO NOTHING
+""")
+register_statement("gen_insert_student", """
+    INSERT INTO students (first_name, last_name, email, date_of_birth, major)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (email) DO NOTHING
+    RETURNING student_id
+""")
+register_statement("gen_insert_enrollment", """
+    INSERT INTO enrollments (student_id, course_id, semester, enrollment_date)
+    VALUES ($1, $2, $3, CURRENT_DATE)
+    ON CONFLICT (student_id, course_id, semester) DO NOTHING
+    RETURNING enrollment_id
+""")
+register_statement("gen_grade_exists", "SELECT 1 FROM grades WHERE enrollment_id = $1 LIMIT 1")
+register_statement("gen_insert_grade", """
+    INSERT INTO grades (enrollment_id, assessment_type, score, weight)
+    VALUES ($1, $2, $3, $4)
+""")
+register_statement("gen_attendance_exists", "SELECT 1 FROM attendance WHERE enrollment_id = $1 LIMIT 1")
+register_statement("gen_insert_attendance", """
+    INSERT INTO attendance (enrollment_id, attendance_date, status)
+    VALUES ($1, $2, $3)
+""")
+
 def get_db_connection():
     try:
         conn = psycopg2.connect(**DB_PARAMS)
@@ -71,11 +101,7 @@ def create_courses(cursor):
     print(f"--- Checking/Inserting {len(courses)} Courses (Requirement: 20-30) ---")
     for name, code, credits in courses:
         try:
-            cursor.execute("""
-                INSERT INTO courses (course_name, course_code, credits)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (course_code) DO NOTHING;
-            """, (name, code, credits))
+            execute_prepared(cursor, "gen_insert_course", (name, code, credits))
         except Exception as e:
             print(f"Error inserting course {code}: {e}")
 
@@ -100,12 +126,7 @@ def create_students(cursor, num_students):
         dob = fake.date_of_birth(minimum_age=18, maximum_age=35)
         major = random.choice(majors)
         
-        cursor.execute("""
-            INSERT INTO students (first_name, last_name, email, date_of_birth, major)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (email) DO NOTHING
-            RETURNING student_id;
-        """, (first_name, last_name, email, dob, major))
+        execute_prepared(cursor, "gen_insert_student", (first_name, last_name, email, dob, major))
         
         if cursor.fetchone():
             count += 1
@@ -138,12 +159,7 @@ def enroll_students(cursor):
         
         for course_id in courses_to_take:
             semester = random.choice(semesters)
-            cursor.execute("""
-                INSERT INTO enrollments (student_id, course_id, semester, enrollment_date)
-                VALUES (%s, %s, %s, CURRENT_DATE)
-                ON CONFLICT (student_id, course_id, semester) DO NOTHING
-                RETURNING enrollment_id;
-            """, (student_id, course_id, semester))
+            execute_prepared(cursor, "gen_insert_enrollment", (student_id, course_id, semester))
             
             if cursor.fetchone():
                 count += 1
@@ -168,19 +184,16 @@ def add_grades_and_attendance(cursor):
     
     for enrollment_id in enrollment_ids:
         # VALIDATION: Check if grades exist before inserting
-        cursor.execute("SELECT 1 FROM grades WHERE enrollment_id = %s LIMIT 1", (enrollment_id,))
+        execute_prepared(cursor, "gen_grade_exists", (enrollment_id,))
         if not cursor.fetchone():
             for assess_type, weight in assessments:
                 # VALIDATION: Score range 40-100 (realistic passing/failing mix)
                 score = round(random.uniform(40, 100), 2)
-                cursor.execute("""
-                    INSERT INTO grades (enrollment_id, assessment_type, score, weight)
-                    VALUES (%s, %s, %s, %s);
-                """, (enrollment_id, assess_type, score, weight))
+                execute_prepared(cursor, "gen_insert_grade", (enrollment_id, assess_type, score, weight))
                 grade_count += 1
             
         # VALIDATION: Check attendance before inserting
-        cursor.execute("SELECT 1 FROM attendance WHERE enrollment_id = %s LIMIT 1", (enrollment_id,))
+        execute_prepared(cursor, "gen_attendance_exists", (enrollment_id,))
         if not cursor.fetchone():
             start_date = datetime.now() - timedelta(days=45)
             # Generate 15 days of attendance logs
@@ -189,10 +202,7 @@ def add_grades_and_attendance(cursor):
                 # Skip weekends (validation for realism)
                 if class_date.weekday() < 5: 
                     status = random.choice(attendance_statuses)
-                    cursor.execute("""
-                        INSERT INTO attendance (enrollment_id, attendance_date, status)
-                        VALUES (%s, %s, %s);
-                    """, (enrollment_id, class_date, status))
+                    execute_prepared(cursor, "gen_insert_attendance", (enrollment_id, class_date, status))
                     attendance_count += 1
 
     print(f"  -> Added {grade_count} new grades.")
@@ -223,6 +233,7 @@ def main():
         
         conn.commit()
         print("\nSUCCESS: Data generation complete and fully validated!")
+        print_stats(conn)
         
     except Exception as e:
         conn.rollback()
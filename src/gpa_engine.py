@@ -0,0 +1,279 @@
+import argparse
+import io
+import time
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from db_router import get_router
+
+load_dotenv()
+
+# Same cut-offs as student_transcripts_view, mapped onto a 4.0 grade-point scale
+GRADE_CUTOFFS = np.array([60.0, 70.0, 80.0, 90.0])
+LETTERS = np.array(['F', 'D', 'C', 'B', 'A'])
+GRADE_POINTS = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+
+# One row per graded assessment, ordered so every student and enrollment is contiguous
+GRADE_FRAME_SQL = """
+    COPY (
+        SELECT e.student_id, e.enrollment_id, c.credits, g.score, g.weight
+        FROM enrollments e
+            JOIN courses c ON e.course_id = c.course_id
+            JOIN grades g ON e.enrollment_id = g.enrollment_id
+        WHERE g.score IS NOT NULL
+        ORDER BY e.student_id, e.enrollment_id
+    ) TO STDOUT WITH CSV
+"""
+
+def get_db_connection():
+    try:
+        # Read-only analytics: served by a replica when DB_REPLICA_HOSTS is set
+        return get_router().reader()
+    except Exception as e:
+        print(f"Error connecting to DB: {e}")
+        return None
+
+# ==========================================
+# 1. EXTRACT: ONE COLUMNAR FETCH
+# ==========================================
+def fetch_grade_frame(cursor):
+    """
+    Pulls (student, enrollment, credits, score, weight) for every grade in a single
+    COPY and returns a dict of NumPy column arrays.
+    """
+    buffer = io.StringIO()
+    cursor.copy_expert(GRADE_FRAME_SQL, buffer)
+    buffer.seek(0)
+
+    df = pd.read_csv(
+        buffer,
+        header=None,
+        names=['student_id', 'enrollment_id', 'credits', 'score', 'weight'],
+        dtype={'student_id': np.int64, 'enrollment_id': np.int64, 'credits': np.float64,
+               'score': np.float64, 'weight': np.float64}
+    )
+    return {col: df[col].to_numpy() for col in df.columns}
+
+# ==========================================
+# 2. TRANSFORM: VECTORIZED GROUP-BY
+# ==========================================
+def _dense_codes(keys):
+    """Maps group keys to 0..n-1. O(n) when keys arrive sorted (as from the COPY)."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64), keys
+    if np.all(keys[1:] >= keys[:-1]):
+        starts = np.concatenate(([True], keys[1:] != keys[:-1]))
+        return np.cumsum(starts) - 1, keys[starts]
+    uniques, codes = np.unique(keys, return_inverse=True)
+    return codes, uniques
+
+def letter_grades(scores):
+    """Letter grade per score using the view's 90/80/70/60 cut-offs ('N/A' for NaN)."""
+    letters = LETTERS[np.searchsorted(GRADE_CUTOFFS, scores, side='right')]
+    return np.where(np.isnan(scores), 'N/A', letters)
+
+def grade_points(scores):
+    return GRADE_POINTS[np.searchsorted(GRADE_CUTOFFS, scores, side='right')]
+
+def compute_course_scores(frame):
+    """
+    Assessment-weighted final score per enrollment: sum(score * weight) / sum(weight).
+    Enrollments with any unweighted assessment fall back to the plain average,
+    which matches what student_transcripts_view reports for them.
+    """
+    codes, enrollment_ids = _dense_codes(frame['enrollment_id'])
+    n = len(enrollment_ids)
+    score = frame['score']
+    weight = frame['weight']
+    missing = np.isnan(weight)
+    safe_weight = np.where(missing, 0.0, weight)
+
+    count = np.bincount(codes, minlength=n)
+    score_sum = np.bincount(codes, weights=score, minlength=n)
+    weighted_sum = np.bincount(codes, weights=score * safe_weight, minlength=n)
+    weight_sum = np.bincount(codes, weights=safe_weight, minlength=n)
+    missing_count = np.bincount(codes, weights=missing, minlength=n)
+
+    plain_avg = score_sum / count
+    use_weights = (missing_count == 0) & (weight_sum > 0)
+    final_score = np.where(use_weights, weighted_sum / np.where(use_weights, weight_sum, 1.0), plain_avg)
+
+    # Every row of an enrollment carries the same student and credits; take any one
+    first_row = np.empty(n, dtype=np.int64)
+    first_row[codes] = np.arange(len(codes))
+    return {
+        'enrollment_id': enrollment_ids,
+        'student_id': frame['student_id'][first_row],
+        'credits': frame['credits'][first_row],
+        'assessments': count,
+        'plain_score': plain_avg,
+        'final_score': final_score,
+    }
+
+def compute_student_gpas(courses):
+    """
+    Credit-weighted GPA per student from per-course final scores, reported both on
+    the 0-100 score scale and as 4.0-scale grade points.
+    """
+    codes, student_ids = _dense_codes(courses['student_id'])
+    n = len(student_ids)
+    credits = courses['credits']
+
+    credit_sum = np.bincount(codes, weights=credits, minlength=n)
+    score_sum = np.bincount(codes, weights=courses['final_score'] * credits, minlength=n)
+    points_sum = np.bincount(codes, weights=grade_points(courses['final_score']) * credits, minlength=n)
+    assessments = np.bincount(codes, weights=courses['assessments'], minlength=n).astype(np.int64)
+
+    weighted_score = score_sum / credit_sum
+    return {
+        'student_id': student_ids,
+        'courses': np.bincount(codes, minlength=n),
+        'assessments': assessments,
+        'credits': credit_sum,
+        'weighted_score': weighted_score,
+        'gpa_points': points_sum / credit_sum,
+        'letter_grade': letter_grades(weighted_score),
+        'percentile': percentiles(weighted_score),
+    }
+
+def percentiles(values):
+    """Percent of the cohort scoring strictly below each value (ties share a rank)."""
+    if len(values) == 0:
+        return np.empty(0)
+    ordered = np.sort(values)
+    return np.searchsorted(ordered, values, side='left') / len(values) * 100
+
+def top_k(gpas, k=10, min_assessments=3, key='weighted_score'):
+    """
+    Dean's List: indices of the k best students without a full sort.
+    argpartition is O(n) and finds the k-th best value; only students at or above
+    it are ordered afterwards, by score (desc) then student_id (asc).
+    Filter mirrors analytics.sql (HAVING COUNT(g.score) > 2).
+    """
+    eligible = np.flatnonzero(gpas['assessments'] >= min_assessments)
+    if len(eligible) == 0:
+        return eligible
+    k = min(k, len(eligible))
+    values = gpas[key][eligible]
+    kth_value = values[np.argpartition(-values, k - 1)[k - 1]]
+    # Keep everyone tied with the k-th value so ties are broken by student_id, not by
+    # whichever subset argpartition happened to pick
+    candidates = eligible[values >= kth_value]
+    order = np.lexsort((gpas['student_id'][candidates], -gpas[key][candidates]))
+    return candidates[order][:k]
+
+# ==========================================
+# 3. VALIDATION: CROSS-CHECK AGAINST SQL
+# ==========================================
+def cross_check(cursor, courses, tolerance=0.01):
+    """
+    Recomputes the plain per-enrollment average in SQL (the number the transcript
+    view reports as final_score) and compares it with the NumPy result.
+    Returns the number of mismatching enrollments.
+    """
+    cursor.execute("""
+        SELECT e.enrollment_id, AVG(g.score)
+        FROM enrollments e
+            JOIN grades g ON e.enrollment_id = g.enrollment_id
+        WHERE g.score IS NOT NULL
+        GROUP BY e.enrollment_id
+        ORDER BY e.enrollment_id;
+    """)
+    rows = cursor.fetchall()
+    sql_ids = np.array([r[0] for r in rows], dtype=np.int64)
+    sql_avg = np.array([float(r[1]) for r in rows])
+
+    if len(sql_ids) != len(courses['enrollment_id']):
+        print(f"Cross-check: enrollment count differs (SQL {len(sql_ids)} vs NumPy {len(courses['enrollment_id'])}).")
+        return abs(len(sql_ids) - len(courses['enrollment_id']))
+
+    order = np.argsort(courses['enrollment_id'])
+    mismatches = np.count_nonzero(
+        (sql_ids != courses['enrollment_id'][order])
+        | ~np.isclose(sql_avg, courses['plain_score'][order], atol=tolerance)
+    )
+    print(f"Cross-check: {len(sql_ids) - mismatches}/{len(sql_ids)} enrollments match the SQL average.")
+    return mismatches
+
+# ==========================================
+# 4. BENCHMARK: SYNTHETIC COHORT
+# ==========================================
+def synthetic_frame(num_students, seed=42):
+    """Builds a grade frame shaped like generate_data.py output (3-6 courses, 3 assessments)."""
+    rng = np.random.default_rng(seed)
+    courses_per_student = rng.integers(3, 7, size=num_students)
+    num_enrollments = int(courses_per_student.sum())
+
+    student_of_enrollment = np.repeat(np.arange(1, num_students + 1), courses_per_student)
+    credits_of_enrollment = rng.integers(2, 5, size=num_enrollments).astype(np.float64)
+
+    weights = np.array([0.30, 0.50, 0.20])
+    return {
+        'student_id': np.repeat(student_of_enrollment, 3),
+        'enrollment_id': np.repeat(np.arange(1, num_enrollments + 1), 3),
+        'credits': np.repeat(credits_of_enrollment, 3),
+        'score': np.round(rng.uniform(40, 100, size=num_enrollments * 3), 2),
+        'weight': np.tile(weights, num_enrollments),
+    }
+
+def run_benchmark(num_students, k=10):
+    print(f"--- Benchmark: {num_students:,} synthetic students ---")
+    frame = synthetic_frame(num_students)
+    print(f"  -> {len(frame['score']):,} grade rows")
+
+    start = time.perf_counter()
+    courses = compute_course_scores(frame)
+    gpas = compute_student_gpas(courses)
+    winners = top_k(gpas, k=k)
+    elapsed = time.perf_counter() - start
+
+    print(f"  -> GPAs, letters, percentiles and top-{k} in {elapsed:.2f}s")
+    print_deans_list(gpas, winners)
+
+# ==========================================
+# REPORTING
+# ==========================================
+def print_deans_list(gpas, winners):
+    print(f"\n{'Student ID':>10} | {'Score':>6} | {'GPA':>4} | Grade | Percentile")
+    print("-" * 50)
+    for i in winners:
+        print(f"{gpas['student_id'][i]:>10} | {gpas['weighted_score'][i]:>6.2f} | "
+              f"{gpas['gpa_points'][i]:>4.2f} | {gpas['letter_grade'][i]:^5} | {gpas['percentile'][i]:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Weighted GPA and ranking engine.")
+    parser.add_argument("--top", type=int, default=10, help="Size of the Dean's List")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="Skip the database and rank N synthetic students")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, k=args.top)
+        return
+
+    conn = get_db_connection()
+    if conn is None:
+        return
+    cursor = conn.cursor()
+
+    try:
+        start = time.perf_counter()
+        frame = fetch_grade_frame(cursor)
+        fetched = time.perf_counter()
+        print(f"Fetched {len(frame['score']):,} grade rows in {fetched - start:.2f}s.")
+
+        courses = compute_course_scores(frame)
+        gpas = compute_student_gpas(courses)
+        winners = top_k(gpas, k=args.top)
+        print(f"Ranked {len(gpas['student_id']):,} students in {time.perf_counter() - fetched:.2f}s.")
+
+        cross_check(cursor, courses)
+        print_deans_list(gpas, winners)
+    except Exception as e:
+        print(f"ERROR: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-connection prepared-statement cache for hot, row-at-a-time queries.
+
+Modules register their hot SQL once (with $1, $2... placeholders) and run it with
+execute_prepared(cursor, name, params). The first call on a connection sends
+PREPARE; every later call sends only EXECUTE, so Postgres skips parsing and,
+after a few runs, planning too.
+
+A psycopg2 connection keeps one server session for its whole life, so the cache
+lives exactly as long as the connection. If statements disappear server-side
+anyway (DISCARD ALL, DEALLOCATE), the cache forgets all of them. In autocommit
+mode the statement is re-prepared and retried; inside a transaction the error is
+re-raised untouched, and the transaction's owner decides whether to roll back
+(every statement is re-prepared on its next use).
+
+Note: CALL cannot be prepared in PostgreSQL. The statements inside the
+record_grade / mark_attendance procedures are already plan-cached per session by
+PL/pgSQL, so those calls are left as plain CALLs.
+"""
+import weakref
+from psycopg2 import errors
+
+# name -> SQL text with $n placeholders
+STATEMENTS = {}
+
+_caches = weakref.WeakKeyDictionary()
+
+def register_statement(name, sql):
+    """Adds a named statement to the registry (idempotent for identical SQL)."""
+    if STATEMENTS.get(name, sql) != sql:
+        raise ValueError(f"Prepared statement '{name}' is already registered with different SQL")
+    STATEMENTS[name] = sql
+
+class StatementCache:
+    """Tracks which statements are prepared on one connection's server session."""
+
+    def __init__(self, conn):
+        # Weak, so the cache never keeps its own dictionary key (the connection) alive
+        self._conn = weakref.ref(conn)
+        self.prepared = set()
+        self.hits = {}
+        self.misses = {}
+
+    @property
+    def conn(self):
+        return self._conn()
+
+    def _prepare(self, cursor, name):
+        cursor.execute(f"PREPARE {name} AS {STATEMENTS[name]}")
+        self.prepared.add(name)
+        self.misses[name] = self.misses.get(name, 0) + 1
+
+    def execute(self, cursor, name, params=()):
+        if name in self.prepared:
+            self.hits[name] = self.hits.get(name, 0) + 1
+        else:
+            self._prepare(cursor, name)
+
+        sql = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+        try:
+            cursor.execute(sql, params)
+        except errors.InvalidSqlStatementName:
+            # Statements vanished server-side; DISCARD ALL drops every one of them
+            self.prepared.clear()
+            if not self.conn.autocommit:
+                # The transaction is aborted: leave the rollback (or failure) to its owner
+                raise
+            self._prepare(cursor, name)
+            cursor.execute(sql, params)
+
+    def stats(self):
+        """{name: {"hits": n, "misses": n}} for every statement used on this connection."""
+        names = sorted(set(self.hits) | set(self.misses))
+        return {name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)} for name in names}
+
+def statement_cache(conn):
+    """The cache for `conn`, created on first use and dropped with the connection."""
+    cache = _caches.get(conn)
+    if cache is None:
+        cache = _caches[conn] = StatementCache(conn)
+    return cache
+
+def execute_prepared(cursor, name, params=()):
+    statement_cache(cursor.connection).execute(cursor, name, params)
+
+def print_stats(conn):
+    stats = statement_cache(conn).stats()
+    if not stats:
+        return
+    print("\n--- Prepared Statement Cache ---")
+    for name, counts in stats.items():
+        print(f"  {name:<28} hits={counts['hits']:<8} prepares={counts['misses']}")
@@ -0,0 +1,239 @@
+import argparse
+import statistics
+import time
+from dotenv import load_dotenv
+from db_router import get_router
+
+load_dotenv()
+
+PAGE_SIZE = 20
+
+# Prefix matches are listed alphabetically; keyset = (last_name, first_name, student_id)
+PREFIX_SQL = """
+    SELECT student_id, first_name, last_name, email, major
+    FROM students
+    WHERE (first_name ILIKE %(pattern)s OR last_name ILIKE %(pattern)s OR email ILIKE %(pattern)s)
+      {after}
+    ORDER BY last_name, first_name, student_id
+    LIMIT %(limit)s;
+"""
+PREFIX_AFTER = "AND (last_name, first_name, student_id) > (%(last)s, %(first)s, %(id)s)"
+
+# Fuzzy matches use pg_trgm's % operator (GIN-indexed) and are ranked by similarity;
+# keyset = (score DESC, student_id ASC). similarity() returns real, which does not
+# round-trip through a Python float, so the score is float8 on both sides of the key.
+FUZZY_SQL = """
+    SELECT student_id, first_name, last_name, email, major, score
+    FROM (
+        SELECT student_id, first_name, last_name, email, major,
+               GREATEST(similarity(first_name, %(term)s),
+                        similarity(last_name, %(term)s),
+                        similarity(email, %(term)s))::float8 AS score
+        FROM students
+        WHERE first_name %% %(term)s OR last_name %% %(term)s OR email %% %(term)s
+    ) matches
+    {after}
+    ORDER BY score DESC, student_id
+    LIMIT %(limit)s;
+"""
+FUZZY_AFTER = "WHERE score < %(score)s::float8 OR (score = %(score)s::float8 AND student_id > %(id)s)"
+
+# Course rosters are listed alphabetically; keyset = (last_name, first_name, student_id, enrollment_id)
+ROSTER_SQL = """
+    SELECT s.student_id, s.first_name, s.last_name, s.email, e.semester, e.enrollment_id
+    FROM enrollments e
+        JOIN students s ON e.student_id = s.student_id
+        JOIN courses c ON e.course_id = c.course_id
+    WHERE c.course_code = %(code)s
+      {semester}
+      {after}
+    ORDER BY s.last_name, s.first_name, s.student_id, e.enrollment_id
+    LIMIT %(limit)s;
+"""
+ROSTER_AFTER = ("AND (s.last_name, s.first_name, s.student_id, e.enrollment_id) "
+                "> (%(last)s, %(first)s, %(id)s, %(enrollment)s)")
+
+def get_db_connection(read_only=True):
+    try:
+        # Searches can run on a replica; the benchmark writes, so it needs the primary
+        router = get_router()
+        return router.reader() if read_only else router.primary()
+    except Exception as e:
+        print(f"Error connecting to DB: {e}")
+        return None
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _page(cursor, page_size):
+    # One extra row tells us whether another page exists without a COUNT(*)
+    rows = cursor.fetchall()
+    return rows[:page_size], len(rows) > page_size
+
+# ==========================================
+# LIBRARY API
+# ==========================================
+def search_students(cursor, term, mode='prefix', page_size=PAGE_SIZE, after=None):
+    """
+    Finds students by first name, last name or email.
+    mode='prefix' matches names/emails starting with `term`; mode='fuzzy' tolerates typos.
+    Returns (rows, next_key); pass next_key back as `after` for the next page (None = last page).
+    """
+    term = term.strip()
+    params = {"limit": page_size + 1}
+
+    if mode == 'prefix':
+        params["pattern"] = _escape_like(term) + '%'
+        if after:
+            params.update(last=after[0], first=after[1], id=after[2])
+        cursor.execute(PREFIX_SQL.format(after=PREFIX_AFTER if after else ""), params)
+        rows, more = _page(cursor, page_size)
+        next_key = (rows[-1][2], rows[-1][1], rows[-1][0]) if more else None
+    elif mode == 'fuzzy':
+        params["term"] = term
+        if after:
+            params.update(score=after[0], id=after[1])
+        cursor.execute(FUZZY_SQL.format(after=FUZZY_AFTER if after else ""), params)
+        rows, more = _page(cursor, page_size)
+        next_key = (rows[-1][5], rows[-1][0]) if more else None
+    else:
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    return rows, next_key
+
+def course_roster(cursor, course_code, semester=None, page_size=PAGE_SIZE, after=None):
+    """Lists a course's students alphabetically. Returns (rows, next_key) like search_students."""
+    params = {"code": course_code, "semester": semester, "limit": page_size + 1}
+    if after:
+        params.update(last=after[0], first=after[1], id=after[2], enrollment=after[3])
+
+    cursor.execute(ROSTER_SQL.format(
+        semester="AND e.semester = %(semester)s" if semester else "",
+        after=ROSTER_AFTER if after else ""
+    ), params)
+    rows, more = _page(cursor, page_size)
+    next_key = (rows[-1][2], rows[-1][1], rows[-1][0], rows[-1][5]) if more else None
+    return rows, next_key
+
+# ==========================================
+# BENCHMARK
+# ==========================================
+def _seed_benchmark_students(cursor, num_students, seed=42):
+    """Bulk-inserts synthetic students from Faker name pools in one INSERT ... SELECT."""
+    from faker import Faker
+
+    fake = Faker('en_GB')
+    fake.seed_instance(seed)
+    firsts = [fake.first_name() for _ in range(1000)]
+    lasts = [fake.last_name() for _ in range(1000)]
+
+    cursor.execute("""
+        INSERT INTO students (first_name, last_name, email, major)
+        SELECT f.name, l.name,
+               lower(f.name || '.' || replace(l.name, ' ', '') || '.' || i) || '@bench.capaciti.co.za',
+               'Benchmark'
+        FROM generate_series(1, %(n)s::bigint) AS i
+            CROSS JOIN LATERAL (SELECT (%(firsts)s::text[])[1 + (i * 7919) %% 1000] AS name) f
+            CROSS JOIN LATERAL (SELECT (%(lasts)s::text[])[1 + (i * 104729) %% 997] AS name) l;
+    """, {"n": num_students, "firsts": firsts, "lasts": lasts})
+    cursor.execute("ANALYZE students;")
+    return firsts, lasts
+
+def _time_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+def _plan_indexes(cursor):
+    """Index names in the plan of the cursor's last query (what the timings actually used)."""
+    cursor.execute(b"EXPLAIN (FORMAT JSON) " + cursor.query)
+    found, nodes = [], [cursor.fetchone()[0][0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Index Name" in node and node["Index Name"] not in found:
+            found.append(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return ", ".join(found) or "none (sequential scan)"
+
+def run_benchmark(conn, num_students, runs=50):
+    """
+    Seeds `num_students` synthetic students inside a transaction, times searches and
+    deep pagination, then rolls everything back so the live data is untouched.
+    Requires sql/create_indexes.sql (pg_trgm GIN indexes) to have been applied.
+    """
+    conn.autocommit = False
+    cursor = conn.cursor()
+    try:
+        print(f"--- Seeding {num_students:,} benchmark students (rolled back afterwards) ---")
+        start = time.perf_counter()
+        firsts, lasts = _seed_benchmark_students(cursor, num_students)
+        print(f"  -> Seeded in {time.perf_counter() - start:.1f}s")
+
+        last_name = lasts[0]
+        cases = [
+            ("prefix: last name", lambda: search_students(cursor, last_name[:4])),
+            ("prefix: email", lambda: search_students(cursor, firsts[0].lower()[:5])),
+            ("fuzzy: typo in last name", lambda: search_students(cursor, last_name[:-1] + 'x', mode='fuzzy')),
+            ("roster page 1", lambda: course_roster(cursor, 'DE101')),
+        ]
+
+        def deep_keyset(pages=50):
+            key = None
+            for _ in range(pages):
+                _, key = search_students(cursor, last_name[:3], after=key)
+                if key is None:
+                    break
+
+        def deep_offset(pages=50):
+            cursor.execute("""
+                SELECT student_id, first_name, last_name, email, major FROM students
+                WHERE first_name ILIKE %(p)s OR last_name ILIKE %(p)s OR email ILIKE %(p)s
+                ORDER BY last_name, first_name, student_id
+                LIMIT %(n)s OFFSET %(o)s;
+            """, {"p": _escape_like(last_name[:3]) + '%', "n": PAGE_SIZE, "o": PAGE_SIZE * (pages - 1)})
+            cursor.fetchall()
+
+        cases.append(("50 pages via keyset", deep_keyset))
+        cases.append(("page 50 via OFFSET (for comparison)", deep_offset))
+
+        print(f"\n{'Case':<38} | {'p50 ms':>8} | {'p95 ms':>8} | Indexes (last query)")
+        print("-" * 100)
+        for label, fn in cases:
+            p50, p95 = _time_ms(fn, runs)
+            print(f"{label:<38} | {p50:>8.2f} | {p95:>8.2f} | {_plan_indexes(cursor)}")
+    finally:
+        conn.rollback()
+        cursor.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Student search (library API + benchmark).")
+    parser.add_argument("term", nargs="?", help="Name or email to search for")
+    parser.add_argument("--fuzzy", action="store_true", help="Tolerate typos instead of prefix matching")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time searches over N seeded students")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = get_db_connection(read_only=not args.benchmark)
+    if conn is None:
+        return
+
+    try:
+        if args.benchmark:
+            run_benchmark(conn, args.benchmark, runs=args.runs)
+        elif args.term:
+            rows, _ = search_students(conn.cursor(), args.term, mode='fuzzy' if args.fuzzy else 'prefix')
+            for row in rows:
+                print(f"{row[0]:>8} | {row[1]} {row[2]:<25} | {row[3]}")
+        else:
+            parser.print_help()
+    except Exception as e:
+        print(f"ERROR: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Isolated test databases for the suite.
+
+The schema and a deterministic seed are built ONCE into a template database;
+every test process then gets its own `CREATE DATABASE ... TEMPLATE` clone, so
+tests never touch the live data and can run in parallel with pytest-xdist:
+
+    python -m pytest tests -n auto
+
+Point TEST_DB_* at a local throwaway Postgres (the user needs CREATEDB).
+"""
+import atexit
+import contextlib
+import hashlib
+import os
+import random
+import sys
+import unittest
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(ROOT_DIR, 'src'))
+
+# Throwaway server used by the tests (never the production DB_* settings)
+ADMIN_PARAMS = {
+    "host": os.getenv("TEST_DB_HOST", "localhost"),
+    "port": os.getenv("TEST_DB_PORT", "5432"),
+    "user": os.getenv("TEST_DB_USER", "postgres"),
+    "password": os.getenv("TEST_DB_PASS"),
+    "database": os.getenv("TEST_DB_ADMIN_DB", "postgres")
+}
+
+TEMPLATE_NAME = "srms_test_template"
+SCHEMA_FILES = ["create_tables.sql", "create_indexes.sql", "create_views.sql", "stored_procedures.sql"]
+SEED = 2047
+SEED_STUDENTS = 150
+
+# Arbitrary constant: serializes template builds across xdist workers
+TEMPLATE_LOCK_KEY = 20470029
+
+_worker_db = {}
+
+def _admin_connection():
+    conn = psycopg2.connect(**ADMIN_PARAMS)
+    conn.autocommit = True  # CREATE/DROP DATABASE cannot run inside a transaction
+    return conn
+
+def _db_params(name):
+    return {**ADMIN_PARAMS, "database": name}
+
+def _fingerprint():
+    """
+    Changes whenever the schema, seed, seeding code or ETL source files change,
+    forcing a template rebuild.
+    """
+    digest = hashlib.sha256(f"{SEED}:{SEED_STUDENTS}".encode())
+    paths = [os.path.join(ROOT_DIR, 'sql', f) for f in SCHEMA_FILES]
+    paths += [os.path.join(ROOT_DIR, 'src', f)
+              for f in ('generate_data.py', 'etl_pipeline.py', 'prepared_statements.py')]
+    # Everything the ETL step reads; sorted so the walk order never changes the hash
+    for folder, dirs, files in os.walk(os.path.join(ROOT_DIR, 'raw_data')):
+        dirs.sort()
+        paths += [os.path.join(folder, f) for f in sorted(files)]
+    for path in paths:
+        digest.update(os.path.relpath(path, ROOT_DIR).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+@contextlib.contextmanager
+def _working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+# ==========================================
+# 1. TEMPLATE: SCHEMA + DETERMINISTIC SEED
+# ==========================================
+def _seed_template(cursor):
+    import generate_data
+    import etl_pipeline
+
+    for name in SCHEMA_FILES:
+        with open(os.path.join(ROOT_DIR, 'sql', name)) as f:
+            cursor.execute(f.read())
+
+    # Same code paths as a real deployment, with fixed seeds for repeatable data
+    random.seed(SEED)
+    generate_data.fake.seed_instance(SEED)
+    generate_data.create_courses(cursor)
+    generate_data.create_students(cursor, num_students=SEED_STUDENTS)
+    generate_data.enroll_students(cursor)
+    generate_data.add_grades_and_attendance(cursor)
+
+    # ETL reads raw_data/ relative to the repo root
+    with _working_directory(ROOT_DIR):
+        etl_pipeline.process_students(cursor)
+        etl_pipeline.process_courses(cursor)
+        etl_pipeline.process_grades(cursor)
+
+def ensure_template():
+    """Builds the template database unless an up-to-date one already exists."""
+    fingerprint = _fingerprint()
+    admin = _admin_connection()
+    cursor = admin.cursor()
+    try:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (TEMPLATE_LOCK_KEY,))
+        cursor.execute("""
+            SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = %s
+        """, (TEMPLATE_NAME,))
+        existing = cursor.fetchone()
+        if existing and existing[0] == fingerprint:
+            return
+
+        print(f"\nBuilding test template database '{TEMPLATE_NAME}'...")
+        if existing:
+            cursor.execute(f"ALTER DATABASE {TEMPLATE_NAME} WITH IS_TEMPLATE false")
+            cursor.execute(f"DROP DATABASE {TEMPLATE_NAME} WITH (FORCE)")
+        cursor.execute(f"CREATE DATABASE {TEMPLATE_NAME}")
+
+        conn = psycopg2.connect(**_db_params(TEMPLATE_NAME))
+        try:
+            _seed_template(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+
+        # No connections allowed: cloning requires the template to be idle
+        cursor.execute(f"ALTER DATABASE {TEMPLATE_NAME} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false")
+        cursor.execute(f"COMMENT ON DATABASE {TEMPLATE_NAME} IS %s", (fingerprint,))
+    finally:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (TEMPLATE_LOCK_KEY,))
+        cursor.close()
+        admin.close()
+
+# ==========================================
+# 2. PER-WORKER CLONES
+# ==========================================
+def clone_database(name):
+    """Fresh copy of the template (a file-level copy, far faster than re-seeding)."""
+    admin = _admin_connection()
+    try:
+        cursor = admin.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS {name}")
+        cursor.execute(f"CREATE DATABASE {name} TEMPLATE {TEMPLATE_NAME}")
+    finally:
+        admin.close()
+    return _db_params(name)
+
+def drop_database(name):
+    admin = _admin_connection()
+    try:
+        admin.cursor().execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+    finally:
+        admin.close()
+
+def worker_db_params():
+    """
+    Connection parameters for this process's private test database.
+    Created on first use, dropped when the process exits.
+    """
+    if not _worker_db:
+        # pytest-xdist names its workers gw0, gw1, ...; serial runs use 'main'
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        name = f"srms_test_{worker}"
+        ensure_template()
+        _worker_db.update(clone_database(name))
+        atexit.register(drop_database, name)
+    return dict(_worker_db)
+
+# ==========================================
+# 3. BASE CLASS FOR DATABASE TESTS
+# ==========================================
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Each test gets its own connection to this process's private clone (self.conn,
+    self.cursor). The open transaction is rolled back afterwards, so tests stay independent.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.db_params = worker_db_params()
+
+    def setUp(self):
+        self.conn = psycopg2.connect(**self.db_params)
+        self.conn.autocommit = False  # Use transactions we can rollback
+        self.cursor = self.conn.cursor()
+
+    def tearDown(self):
+        self.conn.rollback()
+        self.conn.close()
@@ -0,0 +1,146 @@
+import unittest
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+import os
+from db_fixtures import DatabaseTestCase
+import archive_semesters
+from archive_semesters import archive_semester, fetch_transcript
+
+EMAIL = "archived.student@archive.test"
+
+class TestArchiveSemesters(DatabaseTestCase):
+
+    def setUp(self):
+        """
+        One student with a weighted course in 'Winter 2001' and one in 'Winter 2002'.
+        archive_semester commits, so the rows are committed here and removed in tearDown.
+        """
+        super().setUp()
+        self.archive_dir = tempfile.mkdtemp()
+        self.cursor.execute("""
+            INSERT INTO students (first_name, last_name, email, major)
+            VALUES ('Ada', 'Archive', %s, 'Testing') RETURNING student_id
+        """, (EMAIL,))
+        self.student_id = self.cursor.fetchone()[0]
+        self.cursor.execute("SELECT course_id FROM courses ORDER BY course_id LIMIT 3")
+        self.course_ids = [row[0] for row in self.cursor.fetchall()]
+        self.enroll(self.course_ids[0], 'Winter 2001', weight=0.5)
+        self.enroll(self.course_ids[1], 'Winter 2002', weight=0.5)
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.rollback()
+        self.cursor.execute("DELETE FROM students WHERE email = %s", (EMAIL,))  # cascades
+        self.conn.commit()
+        super().tearDown()
+        shutil.rmtree(self.archive_dir)
+
+    def enroll(self, course_id, semester, weight, scores=(71.5, 88.0)):
+        self.cursor.execute("""
+            INSERT INTO enrollments (student_id, course_id, semester)
+            VALUES (%s, %s, %s) RETURNING enrollment_id
+        """, (self.student_id, course_id, semester))
+        enrollment_id = self.cursor.fetchone()[0]
+        for number, score in enumerate(scores, start=1):
+            self.cursor.execute("""
+                INSERT INTO grades (enrollment_id, assessment_type, score, weight)
+                VALUES (%s, %s, %s, %s)
+            """, (enrollment_id, f"Assessment {number}", score, weight))
+        self.cursor.execute("""
+            INSERT INTO attendance (enrollment_id, status) VALUES (%s, 'Present'), (%s, 'Late')
+        """, (enrollment_id, enrollment_id))
+
+    def live_counts(self, semester):
+        self.cursor.execute("""
+            SELECT COUNT(DISTINCT e.enrollment_id), COUNT(DISTINCT g.grade_id), COUNT(DISTINCT a.attendance_id)
+            FROM enrollments e
+                LEFT JOIN grades g ON e.enrollment_id = g.enrollment_id
+                LEFT JOIN attendance a ON e.enrollment_id = a.enrollment_id
+            WHERE e.semester = %s
+        """, (semester,))
+        counts = self.cursor.fetchone()
+        self.conn.rollback()
+        return counts
+
+    def parquet_files(self):
+        return [name for _, _, files in os.walk(self.archive_dir) for name in files if name.endswith('.parquet')]
+
+    # ==========================================
+    # TEST CASE 1: ARCHIVE MOVES ONE SEMESTER
+    # Criteria: archived rows leave the live tables, other semesters stay
+    # ==========================================
+    def test_archive_moves_semester_out_of_live_tables(self):
+        counts = archive_semester(self.conn, 'Winter 2001', self.archive_dir)
+        self.assertEqual(counts, {"enrollments": 1, "grades": 2, "attendance": 2})
+        self.assertEqual(self.live_counts('Winter 2001'), (0, 0, 0))
+        self.assertEqual(self.live_counts('Winter 2002'), (1, 2, 2))
+        self.assertEqual(len(self.parquet_files()), 3)
+
+    # ==========================================
+    # TEST CASE 2: TRANSCRIPTS SURVIVE ARCHIVING
+    # Criteria: archived + live rows equal what the view returned before
+    # ==========================================
+    def test_transcript_unchanged_after_archive(self):
+        before = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.conn.rollback()
+        self.assertEqual(len(before), 2)
+
+        archive_semester(self.conn, 'Winter 2001', self.archive_dir)
+        after = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.assertCountEqual(after, before)
+
+    def test_rearchive_after_all_null_weights(self):
+        # The first part file's weight column is entirely NULL (legacy grades); a later,
+        # weighted part must still read back with it as one dataset
+        self.enroll(self.course_ids[2], 'Winter 2003', weight=None)
+        self.conn.commit()
+        archive_semester(self.conn, 'Winter 2003', self.archive_dir)
+        self.enroll(self.course_ids[0], 'Winter 2003', weight=0.5)
+        self.conn.commit()
+        before = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.conn.rollback()
+
+        archive_semester(self.conn, 'Winter 2003', self.archive_dir)
+        after = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.assertEqual(len(after), 4)
+        self.assertCountEqual(after, before)
+
+    def test_archived_scores_round_like_the_view(self):
+        # 84.125 rounds half up to 84.13; the second average is exactly 70.00, a C, which a
+        # float average (69.999...) would turn into a D
+        self.enroll(self.course_ids[1], 'Winter 2001', weight=None, scores=('84.12', '84.13'))
+        self.enroll(self.course_ids[2], 'Winter 2001', weight=None, scores=('67.02', '67.07', '75.91'))
+        self.conn.commit()
+        before = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.conn.rollback()
+
+        archive_semester(self.conn, 'Winter 2001', self.archive_dir)
+        after = fetch_transcript(self.cursor, EMAIL, self.archive_dir)
+        self.assertCountEqual(after, before)
+        self.assertIn((Decimal('84.13'), 'B'), [row[-2:] for row in after])
+        self.assertIn((Decimal('70.00'), 'C'), [row[-2:] for row in after])
+
+    # ==========================================
+    # TEST CASE 3: VERIFICATION FAILURE
+    # Criteria: a row-count mismatch deletes nothing and leaves no Parquet behind
+    # ==========================================
+    def test_count_mismatch_rolls_back_and_removes_files(self):
+        # Deletes only one of the semester's two grades
+        short_delete = [("grades", """
+            DELETE FROM grades WHERE grade_id = (
+                SELECT MIN(g.grade_id) FROM grades g
+                    JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+                WHERE e.semester = %s)
+        """)] + archive_semesters.DELETE_QUERIES[1:]
+
+        with mock.patch.object(archive_semesters, "DELETE_QUERIES", short_delete):
+            with self.assertRaises(RuntimeError):
+                archive_semester(self.conn, 'Winter 2001', self.archive_dir)
+
+        self.assertEqual(self.live_counts('Winter 2001'), (1, 2, 2))
+        self.assertEqual(self.parquet_files(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import contextlib
+import io
+import threading
+from unittest import mock
+import psycopg2
+from psycopg2 import errors
+from db_fixtures import DatabaseTestCase
+from bulk_purge import purge_students
+
+COHORT_SIZE = 7
+
+class TestBulkPurge(DatabaseTestCase):
+
+    def setUp(self):
+        """
+        A cohort of students (plus one bystander) with enrollments, grades and attendance.
+        purge_students commits, so the rows are committed here and removed in tearDown.
+        """
+        super().setUp()
+        self.blockers = []
+        self.cursor.execute("SELECT course_id FROM courses ORDER BY course_id LIMIT 2")
+        course_ids = [row[0] for row in self.cursor.fetchall()]
+
+        self.ids = [self.add_student(f"cohort{i}@purge.test", course_ids) for i in range(COHORT_SIZE)]
+        self.bystander = self.add_student("bystander@purge.test", course_ids)
+        self.conn.commit()
+
+    def tearDown(self):
+        for blocker in self.blockers:
+            blocker.close()  # releases its row lock before the cleanup DELETE
+        self.conn.rollback()
+        self.cursor.execute("DELETE FROM students WHERE email LIKE '%%@purge.test'")  # cascades
+        self.conn.commit()
+        super().tearDown()
+
+    def add_student(self, email, course_ids):
+        self.cursor.execute("""
+            INSERT INTO students (first_name, last_name, email, major)
+            VALUES ('Pat', 'Purge', %s, 'Testing') RETURNING student_id
+        """, (email,))
+        student_id = self.cursor.fetchone()[0]
+        for course_id in course_ids:
+            self.cursor.execute("""
+                INSERT INTO enrollments (student_id, course_id, semester)
+                VALUES (%s, %s, 'Fall 2024') RETURNING enrollment_id
+            """, (student_id, course_id))
+            enrollment_id = self.cursor.fetchone()[0]
+            self.cursor.execute("""
+                INSERT INTO grades (enrollment_id, assessment_type, score, weight)
+                VALUES (%s, 'Midterm', 70, 0.5), (%s, 'Final', 80, 0.5)
+            """, (enrollment_id, enrollment_id))
+            self.cursor.execute("INSERT INTO attendance (enrollment_id, status) VALUES (%s, 'Present')",
+                                (enrollment_id,))
+        return student_id
+
+    def remaining(self, student_ids):
+        """(students, enrollments, grades, attendance) rows left for these students."""
+        self.cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM students WHERE student_id = ANY(%(ids)s)),
+                   (SELECT COUNT(*) FROM enrollments WHERE student_id = ANY(%(ids)s)),
+                   (SELECT COUNT(*) FROM grades g JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+                    WHERE e.student_id = ANY(%(ids)s)),
+                   (SELECT COUNT(*) FROM attendance a JOIN enrollments e ON a.enrollment_id = e.enrollment_id
+                    WHERE e.student_id = ANY(%(ids)s))
+        """, {"ids": student_ids})
+        counts = self.cursor.fetchone()
+        self.conn.rollback()
+        return counts
+
+    def hold_row_lock(self, student_id):
+        """Second session holding a FOR UPDATE lock on one target, like a slow CLI edit."""
+        blocker = psycopg2.connect(**self.db_params)
+        blocker.cursor().execute("SELECT 1 FROM students WHERE student_id = %s FOR UPDATE", (student_id,))
+        self.blockers.append(blocker)
+        return blocker
+
+    def purge(self, **kwargs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            totals = purge_students(self.conn, self.ids, **kwargs)
+        return totals, output.getvalue()
+
+    # ==========================================
+    # TEST CASE 1: BATCHED PURGE
+    # Criteria: every child row is gone, other students are untouched
+    # ==========================================
+    def test_purge_across_batches(self):
+        totals, output = self.purge(batch_size=3, pause=0)
+
+        self.assertIn("in 3 batch(es)", output)
+        self.assertEqual(totals, {"grades": COHORT_SIZE * 4, "attendance": COHORT_SIZE * 2,
+                                  "enrollments": COHORT_SIZE * 2, "students": COHORT_SIZE})
+        self.assertEqual(self.remaining(self.ids), (0, 0, 0, 0))
+        self.assertEqual(self.remaining([self.bystander]), (1, 2, 4, 2))
+
+    # ==========================================
+    # TEST CASE 2: LOCK TIMEOUTS
+    # Criteria: a locked batch is rolled back and retried, never half-deleted
+    # ==========================================
+    def test_lock_timeout_retried_until_released(self):
+        blocker = self.hold_row_lock(self.ids[-1])
+        threading.Timer(0.3, blocker.rollback).start()
+
+        # Retries back off 0.1s, 0.2s, ...
+        totals, output = self.purge(batch_size=COHORT_SIZE, pause=0, lock_timeout="100ms",
+                                    max_retries=10, backoff=0.1)
+
+        self.assertIn("lock timeout, retrying (1/10)", output)
+        self.assertEqual(totals["students"], COHORT_SIZE)
+        self.assertEqual(self.remaining(self.ids), (0, 0, 0, 0))
+
+    def test_lock_timeout_retries_exhausted(self):
+        self.hold_row_lock(self.ids[-1])
+
+        with mock.patch("bulk_purge.time.sleep") as sleep:
+            with self.assertRaises(errors.LockNotAvailable):
+                self.purge(batch_size=4, pause=0, lock_timeout="50ms", max_retries=3, backoff=0.5)
+
+        # No throttle between batches (pause=0), but retries still back off
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0, 0.5, 1.0])
+
+        # First batch committed; the locked batch rolled back as a whole
+        self.assertEqual(self.remaining(self.ids[:4]), (0, 0, 0, 0))
+        self.assertEqual(self.remaining(self.ids[4:]), (3, 6, 12, 6))
+
+    def test_max_retries_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            purge_students(self.conn, self.ids, max_retries=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,9 @@
 import unittest
 import psycopg2
-import sys
-import os
+from db_fixtures import DatabaseTestCase
 
-# Add src to path so we can import db connection
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-from cli_app import DB_PARAMS
-
-class TestStudentRecords(unittest.TestCase):
-    
-    def setUp(self):
-        """Runs before EACH test. Connects to DB."""
-        self.conn = psycopg2.connect(**DB_PARAMS)
-        self.cursor = self.conn.cursor()
-        self.conn.autocommit = False # Use transactions we can rollback
-
-    def tearDown(self):
-        """Runs after EACH test. Rolls back changes so we don't mess up real data."""
-        self.conn.rollback()
-        self.conn.close()
+# Runs against this process's private clone of the seeded template database
+class TestStudentRecords(DatabaseTestCase):
 
     # ==========================================
     # TEST CASE 1: DATA INSERTION & VALIDATION
@@ -0,0 +1,112 @@
+import unittest
+import psycopg2
+import sys
+import os
+
+# Add src to path so we can import the router
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from db_router import ConnectionRouter
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection; LAG_SQL returns the configured lag."""
+
+    def __init__(self, host, lag):
+        self.host = host
+        self.lag = lag
+        self.closed = False
+
+    def set_session(self, readonly, autocommit):
+        self.readonly = readonly
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchone(self):
+        return (self.conn.lag,)
+
+    def close(self):
+        pass
+
+class TestConnectionRouter(unittest.TestCase):
+
+    def setUp(self):
+        """One primary and two replicas on a manual clock."""
+        self.now = 0.0
+        self.lags = {"primary": 0, "replica1": 0, "replica2": 0}
+        self.down = set()
+        self.router = ConnectionRouter(
+            primary_params={"host": "primary"},
+            replicas=[{"host": "replica1"}, {"host": "replica2"}],
+            pin_seconds=5, max_lag_seconds=2, lag_check_interval=1,
+            connect=self.connect, clock=lambda: self.now
+        )
+
+    def connect(self, host):
+        if host in self.down:
+            raise psycopg2.OperationalError(f"{host} is down")
+        return FakeConnection(host, self.lags[host])
+
+    # ==========================================
+    # TEST CASE 1: LOAD BALANCING
+    # ==========================================
+    def test_reads_round_robin_across_replicas(self):
+        hosts = [self.router.reader().host for _ in range(4)]
+        self.assertEqual(hosts, ["replica1", "replica2", "replica1", "replica2"])
+        self.assertTrue(self.router.reader().readonly)
+        self.assertEqual(self.router.primary().host, "primary")
+
+    # ==========================================
+    # TEST CASE 2: READ-YOUR-WRITES
+    # Criteria: reads pinned to the primary for pin_seconds after a write
+    # ==========================================
+    def test_reads_pinned_after_write(self):
+        self.router.writer()
+        self.assertEqual(self.router.reader().host, "primary")
+        self.now = 4.9
+        self.assertEqual(self.router.reader().host, "primary")
+        self.now = 5.0
+        self.assertEqual(self.router.reader().host, "replica1")
+
+    # ==========================================
+    # TEST CASE 3: FALLBACKS
+    # ==========================================
+    def test_lagging_replica_skipped(self):
+        self.lags["replica1"] = 30
+        hosts = {self.router.reader().host for _ in range(4)}
+        self.assertEqual(hosts, {"replica2"})
+
+    def test_all_replicas_lagging_falls_back_to_primary(self):
+        self.lags.update(replica1=30, replica2=None)  # None = not streaming
+        self.assertEqual(self.router.reader().host, "primary")
+
+    def test_disconnected_replica_skipped(self):
+        # LAG_SQL returns NULL when the WAL receiver is not streaming
+        self.lags["replica1"] = None
+        hosts = {self.router.reader().host for _ in range(4)}
+        self.assertEqual(hosts, {"replica2"})
+
+    def test_lag_is_rechecked_after_interval(self):
+        self.lags["replica1"] = 30
+        self.router.reader()
+        self.router._replica_conns[0].lag = 0  # replica caught up
+        self.assertEqual({self.router.reader().host for _ in range(2)}, {"replica2"})
+        self.now = 1.0
+        self.assertEqual({self.router.reader().host for _ in range(2)}, {"replica1", "replica2"})
+
+    def test_unreachable_replica_skipped(self):
+        self.down.add("replica1")
+        hosts = {self.router.reader().host for _ in range(4)}
+        self.assertEqual(hosts, {"replica2"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path so we can import the engine
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import gpa_engine
+
+class TestGpaEngine(unittest.TestCase):
+
+    def setUp(self):
+        """Two students: one with weighted grades, one with unweighted legacy grades."""
+        self.frame = {
+            'student_id':    np.array([1, 1, 1, 1, 2, 2]),
+            'enrollment_id': np.array([10, 10, 11, 11, 20, 20]),
+            'credits':       np.array([3.0, 3.0, 1.0, 1.0, 4.0, 4.0]),
+            'score':         np.array([100.0, 50.0, 90.0, 90.0, 80.0, 90.0]),
+            'weight':        np.array([0.75, 0.25, 0.50, 0.50, np.nan, np.nan]),
+        }
+
+    # ==========================================
+    # TEST CASE 1: ASSESSMENT WEIGHTS
+    # Criteria: grades.weight is honoured, NULL weights fall back to AVG
+    # ==========================================
+    def test_assessment_weighted_scores(self):
+        courses = gpa_engine.compute_course_scores(self.frame)
+        np.testing.assert_array_equal(courses['enrollment_id'], [10, 11, 20])
+        np.testing.assert_allclose(courses['final_score'], [87.5, 90.0, 85.0])
+        np.testing.assert_allclose(courses['plain_score'], [75.0, 90.0, 85.0])
+
+    # ==========================================
+    # TEST CASE 2: CREDIT WEIGHTS & LETTERS
+    # ==========================================
+    def test_credit_weighted_gpa(self):
+        gpas = gpa_engine.compute_student_gpas(gpa_engine.compute_course_scores(self.frame))
+        # Student 1: (87.5 * 3 + 90 * 1) / 4 = 88.125
+        np.testing.assert_allclose(gpas['weighted_score'], [88.125, 85.0])
+        # Student 1: B (3.0) over 3 credits + A (4.0) over 1 credit
+        np.testing.assert_allclose(gpas['gpa_points'], [3.25, 3.0])
+        self.assertEqual(list(gpas['letter_grade']), ['B', 'B'])
+        np.testing.assert_allclose(gpas['percentile'], [50.0, 0.0])
+
+    def test_letter_grade_boundaries(self):
+        scores = np.array([90.0, 89.99, 80.0, 70.0, 60.0, 59.99, np.nan])
+        self.assertEqual(list(gpa_engine.letter_grades(scores)), ['A', 'B', 'B', 'C', 'D', 'F', 'N/A'])
+
+    # ==========================================
+    # TEST CASE 3: RANKING
+    # Criteria: argpartition top-k agrees with a full sort
+    # ==========================================
+    def test_top_k_matches_full_sort(self):
+        frame = gpa_engine.synthetic_frame(5000, seed=7)
+        gpas = gpa_engine.compute_student_gpas(gpa_engine.compute_course_scores(frame))
+        winners = gpa_engine.top_k(gpas, k=25)
+        expected = np.lexsort((gpas['student_id'], -gpas['weighted_score']))[:25]
+        np.testing.assert_array_equal(winners, expected)
+
+    def test_top_k_ties_at_boundary(self):
+        # Integer scores in a narrow band: dozens of students tie at the k-th value
+        rng = np.random.default_rng(5)
+        n = 1000
+        gpas = {
+            'student_id': rng.permutation(np.arange(1, n + 1)),
+            'assessments': np.full(n, 3),
+            'weighted_score': rng.integers(80, 90, size=n).astype(np.float64),
+        }
+        winners = gpa_engine.top_k(gpas, k=10)
+        expected = np.lexsort((gpas['student_id'], -gpas['weighted_score']))[:10]
+        np.testing.assert_array_equal(winners, expected)
+
+    def test_unsorted_input(self):
+        order = np.array([5, 0, 3, 1, 4, 2])
+        shuffled = {col: values[order] for col, values in self.frame.items()}
+        gpas = gpa_engine.compute_student_gpas(gpa_engine.compute_course_scores(shuffled))
+        np.testing.assert_allclose(gpas['weighted_score'], [88.125, 85.0])
+
+if __name__ == '__main__':
+    unittest.main()
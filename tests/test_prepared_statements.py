@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+from psycopg2 import errors
+
+# Add src to path so we can import the cache
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import prepared_statements
+from prepared_statements import register_statement, statement_cache, execute_prepared
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection: records SQL, can lose prepared statements."""
+
+    def __init__(self, autocommit=True):
+        self.autocommit = autocommit
+        self.sent = []
+        self.lost = set()  # statements the server has forgotten (e.g. after DISCARD ALL)
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+
+    def execute(self, sql, params=None):
+        self.connection.sent.append(sql)
+        name = sql.split()[1]
+        if sql.startswith("EXECUTE") and name in self.connection.lost:
+            self.connection.lost.discard(name)
+            raise errors.InvalidSqlStatementName(f"prepared statement \"{name}\" does not exist")
+
+class TestPreparedStatements(unittest.TestCase):
+
+    def setUp(self):
+        register_statement("test_lookup", "SELECT 1 FROM students WHERE student_id = $1")
+        self.conn = FakeConnection()
+        self.cursor = self.conn.cursor()
+
+    # ==========================================
+    # TEST CASE 1: PREPARE ONCE, EXECUTE MANY
+    # ==========================================
+    def test_prepares_once_per_connection(self):
+        for student_id in range(3):
+            execute_prepared(self.cursor, "test_lookup", (student_id,))
+
+        prepares = [sql for sql in self.conn.sent if sql.startswith("PREPARE")]
+        self.assertEqual(prepares, ["PREPARE test_lookup AS SELECT 1 FROM students WHERE student_id = $1"])
+        self.assertEqual(self.conn.sent[-1], "EXECUTE test_lookup (%s)")
+        self.assertEqual(statement_cache(self.conn).stats(), {"test_lookup": {"hits": 2, "misses": 1}})
+
+    # ==========================================
+    # TEST CASE 2: LOST STATEMENTS
+    # Criteria: a statement dropped server-side is re-prepared
+    # ==========================================
+    def test_autocommit_reprepares_and_retries(self):
+        execute_prepared(self.cursor, "test_lookup", (1,))
+        self.conn.lost.add("test_lookup")
+        execute_prepared(self.cursor, "test_lookup", (1,))
+
+        self.assertEqual([sql.split()[0] for sql in self.conn.sent],
+                         ["PREPARE", "EXECUTE", "EXECUTE", "PREPARE", "EXECUTE"])
+        self.assertEqual(self.conn.rollbacks, 0)
+
+    def test_transaction_error_left_to_caller(self):
+        conn = FakeConnection(autocommit=False)
+        cursor = conn.cursor()
+        register_statement("test_other", "SELECT 2")
+        self.addCleanup(prepared_statements.STATEMENTS.pop, "test_other", None)
+        execute_prepared(cursor, "test_lookup", (1,))
+        execute_prepared(cursor, "test_other")
+        conn.lost.add("test_lookup")
+
+        with self.assertRaises(errors.InvalidSqlStatementName):
+            execute_prepared(cursor, "test_lookup", (1,))
+        self.assertEqual(conn.rollbacks, 0)  # the caller's transaction is not ours to end
+
+        # DISCARD ALL drops every statement, so both are prepared again on next use
+        execute_prepared(cursor, "test_lookup", (1,))
+        execute_prepared(cursor, "test_other")
+        prepares = [sql.split()[1] for sql in conn.sent if sql.startswith("PREPARE")]
+        self.assertEqual(prepares, ["test_lookup", "test_other", "test_lookup", "test_other"])
+
+    def test_caches_are_per_connection(self):
+        other = FakeConnection()
+        execute_prepared(self.cursor, "test_lookup", (1,))
+        execute_prepared(other.cursor(), "test_lookup", (1,))
+        self.assertTrue(other.sent[0].startswith("PREPARE"))
+
+    def test_conflicting_registration_rejected(self):
+        with self.assertRaises(ValueError):
+            register_statement("test_lookup", "SELECT 2")
+
+    def tearDown(self):
+        prepared_statements.STATEMENTS.pop("test_lookup", None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from db_fixtures import DatabaseTestCase
+from student_search import search_students
+
+class TestStudentSearch(DatabaseTestCase):
+
+    def setUp(self):
+        """Seven students sharing one last name, so every fuzzy score ties."""
+        super().setUp()
+        self.ids = []
+        for i in range(7):
+            self.cursor.execute("""
+                INSERT INTO students (first_name, last_name, email, major)
+                VALUES ('Tie', 'Quxbarrow', %s, 'Testing')
+                RETURNING student_id
+            """, (f"tie{i}@search.test",))
+            self.ids.append(self.cursor.fetchone()[0])
+
+    def _all_pages(self, mode, term, page_size=3):
+        seen, key = [], None
+        for _ in range(len(self.ids)):  # A broken key would repeat pages forever
+            rows, key = search_students(self.cursor, term, mode=mode, page_size=page_size, after=key)
+            seen.extend(row[0] for row in rows)
+            if key is None:
+                return seen
+        self.fail(f"{mode} search never reached its last page")
+
+    # ==========================================
+    # TEST CASE 1: KEYSET PAGINATION WITH TIES
+    # Criteria: every tied row is returned exactly once, in student_id order
+    # ==========================================
+    def test_fuzzy_pages_through_tied_scores(self):
+        seen = self._all_pages('fuzzy', 'Quxbarow')  # typo on purpose
+        self.assertEqual(seen, sorted(self.ids))
+
+    def test_prefix_pages_through_identical_names(self):
+        seen = self._all_pages('prefix', 'Quxbar')
+        self.assertEqual(seen, sorted(self.ids))
+
+if __name__ == '__main__':
+    unittest.main()